@@ -1,18 +1,48 @@
 import re
+from dataclasses import dataclass
 
-# Atomic masses (IUPAC 2016)
-ATOMIC_MASSES = {
-    'C': 12.0000000,
-    'H': 1.00782503223,
-    'N': 14.0030740048,
-    'O': 15.9949146223,
-    'P': 30.9737619985,
-    'S': 31.9720711744
-}
+import numpy as np
+
+# Element codes used for array-based mass lookups (Hill order: C, H, then alphabetical)
+ELEMENT_ORDER = ('C', 'H', 'N', 'O', 'P', 'S')
+ELEMENT_CODES = {element: code for code, element in enumerate(ELEMENT_ORDER)}
+
+# Atomic masses (IUPAC 2016), indexed by ELEMENT_CODES
+ATOMIC_MASS_ARRAY = np.array([
+    12.0000000,       # C
+    1.00782503223,    # H
+    14.0030740048,    # N
+    15.9949146223,    # O
+    30.9737619985,    # P
+    31.9720711744,    # S
+], dtype=np.float64)
+
+# Dict view kept for scalar lookups and backwards compatibility
+ATOMIC_MASSES = {element: float(ATOMIC_MASS_ARRAY[code])
+                 for element, code in ELEMENT_CODES.items()}
 
 PROTON_MASS = 1.007276466812  # Mass of H+
 
 
+@dataclass(frozen=True)
+class MassTable:
+    """Read-only atomic masses as attributes, for scalar arithmetic (MASSES.H * n)"""
+    __slots__ = ('C', 'H', 'N', 'O', 'P', 'S', 'proton')
+    C: float
+    H: float
+    N: float
+    O: float
+    P: float
+    S: float
+    proton: float
+
+
+MASSES = MassTable(**ATOMIC_MASSES, proton=PROTON_MASS)
+
+# Element/count pairs of a chemical formula, e.g. "C18H37NO2"
+FORMULA_RE = re.compile(r'([A-Z][a-z]?)(\d*)')
+
+
 # ============================================================================
 # ISOTOPE LABELING WITH M/Z CALCULATION
 # ============================================================================
@@ -25,5 +55,10 @@ ISOTOPE_DELTAS = {
     '18O': 2.004244         # ¹⁸O - ¹⁶O (optional)
 }
 
+# Same deltas as an array, so label counts can be applied as counts @ ISOTOPE_DELTA_ARRAY
+ISOTOPE_ORDER = ('2H', '15N', '13C', '18O')
+ISOTOPE_CODES = {isotope: code for code, isotope in enumerate(ISOTOPE_ORDER)}
+ISOTOPE_DELTA_ARRAY = np.array([ISOTOPE_DELTAS[isotope] for isotope in ISOTOPE_ORDER], dtype=np.float64)
+
 # Regex pattern for inserting isotope labels into adducts safely
 ADDUCT_INSERT_RE = re.compile(r'(?P<prefix>[M\]\+\-])')
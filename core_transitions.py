@@ -1,16 +1,113 @@
-import pandas as pd
 import logging
 from typing import List, Optional
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from types import MappingProxyType
+
+import numpy as np
 
 # Import from your new modules
-from constants import PROTON_MASS
-from chemistry import MolecularFormula
+from constants import PROTON_MASS, ELEMENT_ORDER
+from chemistry import MolecularFormula, batch_masses, counts_mass, counts_to_formula
 from database import LipidDatabase, ConfigManager
-from fragment_rules import CeramideFragmentRules, GSLFragmentRules, NegativeFragmentRules
+from fragment_rules import CeramideFragmentRules, GSLFragmentRules, NegativeFragmentRules, GT1_CLASSES
 
 logger = logging.getLogger(__name__)
 
+# Column order of every transition row produced by generate_transition_rows
+TRANSITION_COLUMNS = (
+    'Molecule List Name', 'Molecule', 'Molecule Formula',
+    'Precursor Adduct', 'Precursor m/z', 'Precursor Charge',
+    'Product Name', 'Product Formula', 'Product Adduct',
+    'Product m/z', 'Product Charge',
+)
+
+# Element positions in the counts tuples, for the H2O loss
+_H, _O = ELEMENT_ORDER.index('H'), ELEMENT_ORDER.index('O')
+
+@lru_cache(maxsize=4096)
+def _minus_h2o(counts: tuple):
+    """Formula string and mass of a counts tuple minus H2O (counts clipped at 0)"""
+    counts = list(counts)
+    counts[_H] = max(counts[_H] - 2, 0)
+    counts[_O] = max(counts[_O] - 1, 0)
+    counts = tuple(counts)
+    return counts_to_formula(counts), counts_mass(counts)
+
+# Mass removed for [M-2H]2- fragment ions
+DOUBLE_PROTON_MASS = 2 * PROTON_MASS
+
+@lru_cache(maxsize=65536)
+def _round_mz(mz: float) -> float:
+    """round(mz, 4), memoized: the same fragment m/z recurs across adducts and species"""
+    return round(mz, 4)
+
+# Headgroup fragments come as (name, formula, mass) or (name, formula, mass, flag)
+# tuples; these normalize them once per (class, precursor formula) with the
+# product m/z already computed and rounded.
+@lru_cache(maxsize=4096)
+def _headgroup_ions_positive(lipid_class: str, formula: MolecularFormula) -> tuple:
+    """(name, formula, m/z) of the positive-mode headgroup fragments"""
+    ions = []
+    for frag in GSLFragmentRules.get_headgroup_fragments(lipid_class, formula):
+        if len(frag) == 4 and frag[3] is True:
+            frag_mz = frag[2]  # Already [M+H]+
+        else:
+            frag_mz = frag[2] + PROTON_MASS  # Single proton only for fragment ions
+        ions.append((frag[0], frag[1], _round_mz(frag_mz)))
+    return tuple(ions)
+
+@lru_cache(maxsize=4096)
+def _headgroup_ions_negative(lipid_class: str, formula: MolecularFormula) -> tuple:
+    """(name, formula, neutral mass, m/z) of the negative-mode headgroup fragments"""
+    ions = []
+    for frag in GSLFragmentRules.get_headgroup_fragments_negative(lipid_class, formula):
+        # 4 elements carry the anion flag; loss fragments (3 elements) are neutral
+        if len(frag) == 4 and frag[3]:
+            frag_mz = frag[2]  # Already deprotonated (e.g., sialic acid anion)
+        else:
+            frag_mz = frag[2] - PROTON_MASS  # Other fragments: just deprotonate
+        ions.append((frag[0], frag[1], frag[2], _round_mz(frag_mz)))
+    return tuple(ions)
+
+@lru_cache(maxsize=1024)
+def _chain_ions_negative(lcb_type: str, fa_type: Optional[str]) -> tuple:
+    """(name, formula, m/z) of the negative-mode LCB and FA fragments of a species"""
+    fragments = NegativeFragmentRules.get_lcb_fragments_negative(lcb_type)
+    if fa_type is not None:
+        fragments += NegativeFragmentRules.get_fa_fragments_negative(fa_type)
+    # Anion-flagged fragments are already [M-H]-; the rest are deprotonated here
+    return tuple((frag_name, frag_formula, _round_mz(frag_mass if is_anion else frag_mass - PROTON_MASS))
+                 for frag_name, frag_formula, frag_mass, is_anion in fragments)
+
+# Sphingomyelin-type classes that take ceramide LCB fragments and headgroup fragments
+SM_CLASSES = frozenset({'SM', 'SM4'})
+
+def _is_neu5ac_loss(frag_name: str) -> bool:
+    """Single Neu5Ac loss (309 or 291, e.g. HG(-Neu5Ac,309))"""
+    return '-Neu5Ac,309' in frag_name or '-Neu5Ac,291' in frag_name
+
+# Negative-mode headgroup fragments that are also emitted as [M-2H]2- product
+# ions (for precursors with |z| >= 2): a name predicate per lipid class
+DOUBLY_CHARGED_FILTERS = MappingProxyType({
+    **dict.fromkeys(GT1_CLASSES, _is_neu5ac_loss),
+    'GP1': frozenset({"HG(-Neu5Ac,309)", "HG(-Neu5Ac2,600)"}).__contains__,
+    'nLc10': frozenset({"HG(-HexNAc,221)", "HG(-HexNAcHex,383)", "HG(-HexNAc2Hex,586)"}).__contains__,
+    'nLc8': frozenset({"HG(-Hex,180)"}).__contains__,
+})
+
+def _lcb_fragment_rule(lipid_class: str):
+    """Positive-mode LCB fragment function (lcb_type -> fragments) for a lipid class"""
+    if LipidDatabase.is_ceramide_class(lipid_class):
+        # Ceramides (including doxCer)
+        return partial(CeramideFragmentRules.get_ceramide_fragments, is_doxcer=(lipid_class == 'doxCer'))
+    if lipid_class in SM_CLASSES:
+        # SM and SM4 (sulfatide) use ceramide fragments, never doxCer variants
+        return partial(CeramideFragmentRules.get_ceramide_fragments, is_doxcer=False)
+    if LipidDatabase.is_gsl_class(lipid_class):
+        return GSLFragmentRules.get_ceramide_fragments
+    return lambda lcb_type: ()
+
 def generate_transitions(lipid_class: str, charge_states: List[int] = [1],
                          selected_adducts: Optional[List[str]] = None,
                          selected_lcbs: Optional[List[str]] = None,
@@ -28,19 +125,52 @@ def generate_transitions(lipid_class: str, charge_states: List[int] = [1],
     Returns:
         List of transition dictionaries
     """
+    rows = generate_transition_rows(lipid_class, charge_states, selected_adducts,
+                                    selected_lcbs, selected_fatty_acids)
+    return [dict(zip(TRANSITION_COLUMNS, row)) for row in rows]
+
+def generate_transition_rows(lipid_class: str, charge_states: List[int] = [1],
+                             selected_adducts: Optional[List[str]] = None,
+                             selected_lcbs: Optional[List[str]] = None,
+                             selected_fatty_acids: Optional[List[str]] = None):
+    """
+    Same as generate_transitions, but each transition is a plain tuple in
+    TRANSITION_COLUMNS order. Much lighter than one dict per row; build a
+    DataFrame with pd.DataFrame.from_records(rows, columns=TRANSITION_COLUMNS).
+    """
 
-    logger.info(f"Starting transition generation for {lipid_class} with charge states {charge_states}")
+    logger.info("Starting transition generation for %s with charge states %s", lipid_class, charge_states)
 
     formulas = generate_lipid_formulas(lipid_class, selected_lcbs, selected_fatty_acids)
 
-    transitions = []
+    rows = []
     adducts = get_adduct_definitions(charge_states, selected_adducts)
 
     is_ceramide = LipidDatabase.is_ceramide_class(lipid_class)
-    is_doxcer = (lipid_class == 'doxCer')
     is_gsl = LipidDatabase.is_gsl_class(lipid_class)
 
-    for species_name, formula in formulas.items():
+    # Per-class rule selection, resolved once instead of per species and adduct
+    lcb_fragment_rule = _lcb_fragment_rule(lipid_class)
+    has_headgroup_fragments = is_gsl or lipid_class in SM_CLASSES
+    doubly_charged_filter = DOUBLY_CHARGED_FILTERS.get(lipid_class) if is_gsl else None
+    has_positive = any(adduct.polarity == 'positive' for adduct in adducts)
+    has_negative = any(adduct.polarity == 'negative' for adduct in adducts)
+
+    # Per-fragment debug messages are only emitted when DEBUG is enabled
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    # Precursor and water-loss m/z for every (species, adduct) pair in one
+    # vectorized pass; the loop below only indexes into the rows
+    precursor_masses = batch_masses(formulas.values())
+    h2o_loss = [_minus_h2o(formula.counts) for formula in formulas.values()]
+    h2o_loss_masses = np.array([mass for _, mass in h2o_loss], dtype=np.float64)
+    mass_deltas = np.array([adduct.mass_delta for adduct in adducts], dtype=np.float64)
+    abs_charges = np.abs(np.array([adduct.charge for adduct in adducts], dtype=np.float64))
+    precursor_mz_table = np.round((precursor_masses[:, None] + mass_deltas) / abs_charges, 4).tolist()
+    h2o_loss_mz_table = np.round((h2o_loss_masses[:, None] + mass_deltas) / abs_charges, 4).tolist()
+
+    for (species_name, formula), precursor_mz_row, (h2o_loss_formula_str, _), h2o_loss_mz_row in zip(
+            formulas.items(), precursor_mz_table, h2o_loss, h2o_loss_mz_table):
         lcb_type = species_name.split('/')[0]
 
         # Format precursor name
@@ -50,53 +180,46 @@ def generate_transitions(lipid_class: str, charge_states: List[int] = [1],
             precursor_name = f"{lipid_class} {species_name}"
 
         formula_str = str(formula)
-        precursor_mass = formula.mass()
 
-        for adduct in adducts:
-            precursor_mz = (precursor_mass + adduct.mass_delta) / abs(adduct.charge)
+        # Fragment ions depend on the species but not on the adduct, so their
+        # m/z values are computed here once and reused for every adduct
+        if has_positive:
+            lcb_ions = tuple((frag_name, frag_formula, _round_mz(frag_mass))  # Already [M+H]+
+                             for frag_name, frag_formula, frag_mass in lcb_fragment_rule(lcb_type))
+            if has_headgroup_fragments:
+                hg_ions = _headgroup_ions_positive(lipid_class, formula)
+        if has_negative and has_headgroup_fragments:
+            hg_ions_neg = _headgroup_ions_negative(lipid_class, formula)
+            fa_type = species_name.split('/')[1] if '/' in species_name else None
+            chain_ions_neg = _chain_ions_negative(lcb_type, fa_type)
+            if doubly_charged_filter is not None:
+                # (Neutral_Mass - 2 * Proton_Mass) / 2 for [M-2H]2- product ions
+                doubly_charged_ions = tuple(
+                    (frag_name, f"{frag_name} [Z=2]", frag_formula, _round_mz((frag_mass - DOUBLE_PROTON_MASS) / 2))
+                    for frag_name, frag_formula, frag_mass, _ in hg_ions_neg if doubly_charged_filter(frag_name))
+
+        for adduct, precursor_mz, h2o_loss_mz in zip(adducts, precursor_mz_row, h2o_loss_mz_row):
 
             # ============================================================================
             # PRECURSOR TRANSITION
             # ============================================================================
-            transitions.append({
-                'Molecule List Name': lipid_class,
-                'Molecule': precursor_name,
-                'Molecule Formula': formula_str,
-                'Precursor Adduct': adduct.name,
-                'Precursor m/z': round(precursor_mz, 4),
-                'Precursor Charge': adduct.charge,
-                'Product Name': 'precursor',
-                'Product Formula': formula_str,
-                'Product Adduct': adduct.name,
-                'Product m/z': round(precursor_mz, 4),
-                'Product Charge': adduct.charge
-            })
+            rows.append((
+                lipid_class, precursor_name, formula_str,
+                adduct.name, precursor_mz, adduct.charge,
+                'precursor', formula_str, adduct.name,
+                precursor_mz, adduct.charge,
+            ))
 
             # ============================================================================
             # WATER LOSS (POSITIVE MODE ONLY)
             # ============================================================================
             if adduct.polarity == "positive":
-                h2o_loss_formula = MolecularFormula(dict(formula.elements))
-                h2o_loss_formula.elements['H'] = h2o_loss_formula.elements.get('H', 0) - 2
-                h2o_loss_formula.elements['O'] = h2o_loss_formula.elements.get('O', 0) - 1
-                h2o_loss_formula = MolecularFormula({k: v for k, v in h2o_loss_formula.elements.items() if v > 0})
-                h2o_loss_formula_str = str(h2o_loss_formula)
-                h2o_loss_mass = h2o_loss_formula.mass()
-                h2o_loss_mz = (h2o_loss_mass + adduct.mass_delta) / abs(adduct.charge)
-
-                transitions.append({
-                    'Molecule List Name': lipid_class,
-                    'Molecule': precursor_name,
-                    'Molecule Formula': formula_str,
-                    'Precursor Adduct': adduct.name,
-                    'Precursor m/z': round(precursor_mz, 4),
-                    'Precursor Charge': adduct.charge,
-                    'Product Name': 'precursor-(H2O,18)',
-                    'Product Formula': h2o_loss_formula_str,
-                    'Product Adduct': adduct.name,
-                    'Product m/z': round(h2o_loss_mz, 4),
-                    'Product Charge': adduct.charge
-                })
+                rows.append((
+                    lipid_class, precursor_name, formula_str,
+                    adduct.name, precursor_mz, adduct.charge,
+                    'precursor-(H2O,18)', h2o_loss_formula_str, adduct.name,
+                    h2o_loss_mz, adduct.charge,
+                ))
 
             # Set fragment charge and adduct based on polarity
             fragment_charge = 1 if adduct.charge > 0 else -1
@@ -106,388 +229,159 @@ def generate_transitions(lipid_class: str, charge_states: List[int] = [1],
             # LCB FRAGMENTS (POSITIVE MODE ONLY)
             # ============================================================================
             if adduct.polarity == 'positive':
-                if is_ceramide:
-                    # Ceramides (including doxCer)
-                    lcb_fragments = CeramideFragmentRules.get_ceramide_fragments(lcb_type, is_doxcer)
-                elif lipid_class == 'SM':
-                    # SM uses ceramide fragments, never doxCer variants
-                    lcb_fragments = CeramideFragmentRules.get_ceramide_fragments(lcb_type, is_doxcer=False)
-                elif lipid_class == 'SM4':
-                    # SM4 (sulfatide) uses ceramide fragments
-                    lcb_fragments = CeramideFragmentRules.get_ceramide_fragments(lcb_type, is_doxcer=False)
-                elif is_gsl:
-                    lcb_fragments = GSLFragmentRules.get_ceramide_fragments(lcb_type)
-                else:
-                    lcb_fragments = []
-
-                for frag_name, frag_formula, frag_mass in lcb_fragments:
-                    frag_mz = frag_mass  # Already [M+H]+
-                    transitions.append({
-                        'Molecule List Name': lipid_class,
-                        'Molecule': precursor_name,
-                        'Molecule Formula': formula_str,
-                        'Precursor Adduct': adduct.name,
-                        'Precursor m/z': round(precursor_mz, 4),
-                        'Precursor Charge': adduct.charge,
-                        'Product Name': frag_name,
-                        'Product Formula': frag_formula,
-                        'Product Adduct': fragment_adduct,
-                        'Product m/z': round(frag_mz, 4),
-                        'Product Charge': fragment_charge
-                    })
+                for frag_name, frag_formula, frag_mz in lcb_ions:
+                    rows.append((
+                        lipid_class, precursor_name, formula_str,
+                        adduct.name, precursor_mz, adduct.charge,
+                        frag_name, frag_formula, fragment_adduct,
+                        frag_mz, fragment_charge,
+                    ))
 
             # ============================================================================
             # HEADGROUP AND POLARITY-SPECIFIC FRAGMENTS
             # ============================================================================
-            if is_gsl or lipid_class in ['SM', 'SM4']:
+            if has_headgroup_fragments:
                 if adduct.polarity == 'positive':
                     # === POSITIVE ION MODE ===
-                    hg_fragments = GSLFragmentRules.get_headgroup_fragments(lipid_class, formula)
-
-                    for frag in hg_fragments:
-                        if len(frag) == 4 and frag[3] is True:
-                            frag_name, frag_formula, frag_mass, _ = frag
-                            frag_mz = frag_mass  # Already [M+H]+
-                        else:
-                            frag_name, frag_formula, frag_mass = frag
-                            frag_mz = frag_mass + PROTON_MASS  # Single proton only for fragment ions
-
-                        transitions.append({
-                            'Molecule List Name': lipid_class,
-                            'Molecule': precursor_name,
-                            'Molecule Formula': formula_str,
-                            'Precursor Adduct': adduct.name,
-                            'Precursor m/z': round(precursor_mz, 4),
-                            'Precursor Charge': adduct.charge,
-                            'Product Name': frag_name,
-                            'Product Formula': frag_formula,
-                            'Product Adduct': fragment_adduct,
-                            'Product m/z': round(frag_mz, 4),
-                            'Product Charge': 1  # Always z=1 for product ions
-                        })
+                    for frag_name, frag_formula, frag_mz in hg_ions:
+                        rows.append((
+                            lipid_class, precursor_name, formula_str,
+                            adduct.name, precursor_mz, adduct.charge,
+                            frag_name, frag_formula, fragment_adduct,
+                            frag_mz, 1,  # Always z=1 for product ions
+                        ))
 
                 elif adduct.polarity == 'negative':
                     # === NEGATIVE ION MODE ===
                     # Negative-mode headgroup fragments
-                    hg_fragments_neg = GSLFragmentRules.get_headgroup_fragments_negative(lipid_class, formula)
-                    for frag in hg_fragments_neg:
-                        if len(frag) == 4:  # 4 elements (with diagnostic flag)
-                            frag_name, frag_formula, frag_mass, is_anion = frag
-                        else:  # 3 elements (from loss generators)
-                            frag_name, frag_formula, frag_mass = frag
-                            is_anion = False  # Loss fragments are neutral
-                        # Calculate m/z based on fragment type
-                        if is_anion:
-                            # Already deprotonated (e.g., sialic acid anion)
-                            frag_mz = frag_mass
-                        else:
-                            # Other fragments: just deprotonate
-                            frag_mz = frag_mass - PROTON_MASS
-
-                        transitions.append({
-                            'Molecule List Name': lipid_class,
-                            'Molecule': precursor_name,
-                            'Molecule Formula': formula_str,
-                            'Precursor Adduct': adduct.name,
-                            'Precursor m/z': round(precursor_mz, 4),
-                            'Precursor Charge': adduct.charge,
-                            'Product Name': frag_name,
-                            'Product Formula': frag_formula,
-                            'Product Adduct': fragment_adduct,
-                            'Product m/z': round(frag_mz, 4),
-                            'Product Charge': -1  # Always z=-1 for product ions
-                        })
-
-                    # === DOUBLY-CHARGED FRAGMENTS FOR GT1 (NEGATIVE MODE) ===
-                    if is_gsl and lipid_class in ['GT1a', 'GT1b', 'GT1c'] and abs(adduct.charge) >= 2:
-                        logger.debug(f"Processing doubly-charged fragments for {lipid_class} in {adduct.polarity} mode")
-                        matched_count = 0
-
-                        for frag in hg_fragments_neg:  # ← Use hg_fragments_neg, not hg_fragments!
-                            if len(frag) == 4:
-                                frag_name, frag_formula, frag_mass, is_anion = frag
-                            else:
-                                frag_name, frag_formula, frag_mass = frag
-
-                            # Match single Neu5Ac loss
-                            if '-Neu5Ac,309' in frag_name or '-Neu5Ac,291' in frag_name:
-                                matched_count += 1
-                                logger.debug(f"Matched fragment: {frag_name}")
-
-                                # Negative mode: [M-2H]2- calculation
-                                # (Neutral_Mass - 2 * Proton_Mass) / 2
-                                doubly_charged_mz = (frag_mass - 2 * PROTON_MASS) / 2
-
-                                transitions.append({
-                                    'Molecule List Name': lipid_class,
-                                    'Molecule': precursor_name,
-                                    'Molecule Formula': formula_str,
-                                    'Precursor Adduct': adduct.name,
-                                    'Precursor m/z': round(precursor_mz, 4),
-                                    'Precursor Charge': adduct.charge,
-                                    'Product Name': f"{frag_name} [Z=2]",
-                                    'Product Formula': frag_formula,
-                                    'Product Adduct': '[M-2H]2-',
-                                    'Product m/z': round(doubly_charged_mz, 4),
-                                    'Product Charge': -2
-                                })
-                        if matched_count > 0:
-                            logger.info(f"Generated {matched_count} doubly-charged fragments for {lipid_class}")
-
-                    if is_gsl and lipid_class == 'GP1' and abs(adduct.charge) >= 2:
-                        logger.debug(f"Processing doubly-charged fragments for {lipid_class} in {adduct.polarity} mode")
-                        matched_count = 0
-
-                        for frag in hg_fragments_neg:
-                            if len(frag) == 4:
-                                frag_name, frag_formula, frag_mass, is_anion = frag
-                            else:
-                                frag_name, frag_formula, frag_mass = frag
-
-                            # Only generate doubly-charged for these losses
-                            if frag_name in ["HG(-Neu5Ac,309)", "HG(-Neu5Ac2,600)"]:
-                                matched_count += 1
-                                logger.debug(f"Matched fragment: {frag_name}")
-
-                                doubly_charged_mz = (frag_mass - 2 * PROTON_MASS) / 2
-                                transitions.append({
-                                    'Molecule List Name': lipid_class,
-                                    'Molecule': precursor_name,
-                                    'Molecule Formula': formula_str,
-                                    'Precursor Adduct': adduct.name,
-                                    'Precursor m/z': round(precursor_mz, 4),
-                                    'Precursor Charge': adduct.charge,
-                                    'Product Name': f"{frag_name} [Z=2]",
-                                    'Product Formula': frag_formula,
-                                    'Product Adduct': '[M-2H]2-',
-                                    'Product m/z': round(doubly_charged_mz, 4),
-                                    'Product Charge': -2
-                                })
-                        if matched_count > 0:
-                            logger.info(f"Generated {matched_count} doubly-charged fragments for {lipid_class}")
-
-                    # === DOUBLY-CHARGED FRAGMENTS FOR nLc SERIES (NEGATIVE MODE) ===
-                    if is_gsl and lipid_class in ['nLc10', 'nLc8'] and abs(adduct.charge) >= 2:
-                        logger.debug(f"Processing doubly-charged fragments for {lipid_class} in {adduct.polarity} mode")
-                        matched_count = 0
-
-                        for frag in hg_fragments_neg:
-                            if len(frag) == 4:
-                                frag_name, frag_formula, frag_mass, is_anion = frag
-                            else:
-                                frag_name, frag_formula, frag_mass = frag
-
-                            # nLc10: Match specific fragments for doubly charged
-                            if lipid_class == 'nLc10':
-                                if frag_name in ["HG(-HexNAc,221)", "HG(-HexNAcHex,383)", "HG(-HexNAc2Hex,586)"]:
-                                    matched_count += 1
-                                    logger.debug(f"Matched fragment: {frag_name}")
-
-                                    # Negative mode: (M - 2H) / 2
-                                    doubly_charged_mz = (frag_mass - 2 * PROTON_MASS) / 2
-
-                                    transitions.append({
-                                        'Molecule List Name': lipid_class,
-                                        'Molecule': precursor_name,
-                                        'Molecule Formula': formula_str,
-                                        'Precursor Adduct': adduct.name,
-                                        'Precursor m/z': round(precursor_mz, 4),
-                                        'Precursor Charge': adduct.charge,
-                                        'Product Name': f"{frag_name} [Z=2]",
-                                        'Product Formula': frag_formula,
-                                        'Product Adduct': '[M-2H]2-',
-                                        'Product m/z': round(doubly_charged_mz, 4),
-                                        'Product Charge': -2
-                                    })
-
-                            # nLc8: Match HG(-Hex,180) for doubly charged
-                            elif lipid_class == 'nLc8':
-                                if frag_name == "HG(-Hex,180)":
-                                    matched_count += 1
-                                    logger.debug(f"Matched fragment: {frag_name}")
-
-                                    # Negative mode: (M - 2H) / 2
-                                    doubly_charged_mz = (frag_mass - 2 * PROTON_MASS) / 2
-
-                                    transitions.append({
-                                        'Molecule List Name': lipid_class,
-                                        'Molecule': precursor_name,
-                                        'Molecule Formula': formula_str,
-                                        'Precursor Adduct': adduct.name,
-                                        'Precursor m/z': round(precursor_mz, 4),
-                                        'Precursor Charge': adduct.charge,
-                                        'Product Name': f"{frag_name} [Z=2]",
-                                        'Product Formula': frag_formula,
-                                        'Product Adduct': '[M-2H]2-',
-                                        'Product m/z': round(doubly_charged_mz, 4),
-                                        'Product Charge': -2
-                                    })
-
-                        if matched_count > 0:
-                            logger.info(f"Generated {matched_count} doubly-charged fragments for {lipid_class}")
-
-
-                    # Negative-mode LCB fragments (universal for all GSLs)
-                    lcb_fragments_neg = NegativeFragmentRules.get_lcb_fragments_negative(lcb_type)
-
-                    # Check is_anion flag
-                    for frag_name, frag_formula, frag_mass, is_anion in lcb_fragments_neg:
-
-                        # Calculate m/z based on flag
-                        if is_anion:
-                            frag_mz = frag_mass
-                        else:
-                            frag_mz = frag_mass - PROTON_MASS
-
-                        transitions.append({
-                            'Molecule List Name': lipid_class,
-                            'Molecule': precursor_name,
-                            'Molecule Formula': formula_str,
-                            'Precursor Adduct': adduct.name,
-                            'Precursor m/z': round(precursor_mz, 4),
-                            'Precursor Charge': adduct.charge,
-                            'Product Name': frag_name,
-                            'Product Formula': frag_formula,
-                            'Product Adduct': fragment_adduct,
-                            'Product m/z': round(frag_mz, 4),
-                            'Product Charge': fragment_charge
-                        })
-
-                    # Negative-mode FA fragments (universal for all GSLs)
-                    if '/' in species_name:
-                        fa_type = species_name.split('/')[1]
-                        fa_fragments_neg = NegativeFragmentRules.get_fa_fragments_negative(fa_type)
-
-                        # Check is_anion flag
-                        for frag_name, frag_formula, frag_mass, is_anion in fa_fragments_neg:
-
-                            # Calculate m/z based on flag
-                            if is_anion:
-                                frag_mz = frag_mass
-                            else:
-                                frag_mz = frag_mass - PROTON_MASS
-
-                            transitions.append({
-                                'Molecule List Name': lipid_class,
-                                'Molecule': precursor_name,
-                                'Molecule Formula': formula_str,
-                                'Precursor Adduct': adduct.name,
-                                'Precursor m/z': round(precursor_mz, 4),
-                                'Precursor Charge': adduct.charge,
-                                'Product Name': frag_name,
-                                'Product Formula': frag_formula,
-                                'Product Adduct': fragment_adduct,
-                                'Product m/z': round(frag_mz, 4),
-                                'Product Charge': fragment_charge
-                            })
-
-    return transitions
-
-@dataclass
+                    for frag_name, frag_formula, _, frag_mz in hg_ions_neg:
+                        rows.append((
+                            lipid_class, precursor_name, formula_str,
+                            adduct.name, precursor_mz, adduct.charge,
+                            frag_name, frag_formula, fragment_adduct,
+                            frag_mz, -1,  # Always z=-1 for product ions
+                        ))
+
+                    # === DOUBLY-CHARGED FRAGMENTS (GT1, GP1, nLc10, nLc8; NEGATIVE MODE) ===
+                    if doubly_charged_filter is not None and abs(adduct.charge) >= 2:
+                        logger.debug("Processing doubly-charged fragments for %s in %s mode", lipid_class, adduct.polarity)
+
+                        for frag_name, product_name, frag_formula, doubly_charged_mz in doubly_charged_ions:
+                            if debug_enabled:
+                                logger.debug("Matched fragment: %s", frag_name)
+                            rows.append((
+                                lipid_class, precursor_name, formula_str,
+                                adduct.name, precursor_mz, adduct.charge,
+                                product_name, frag_formula, '[M-2H]2-',
+                                doubly_charged_mz, -2,
+                            ))
+                        if doubly_charged_ions:
+                            logger.info("Generated %d doubly-charged fragments for %s", len(doubly_charged_ions), lipid_class)
+
+                    # Negative-mode LCB and FA fragments (universal for all GSLs)
+                    for frag_name, frag_formula, frag_mz in chain_ions_neg:
+                        rows.append((
+                            lipid_class, precursor_name, formula_str,
+                            adduct.name, precursor_mz, adduct.charge,
+                            frag_name, frag_formula, fragment_adduct,
+                            frag_mz, fragment_charge,
+                        ))
+
+    return rows
+
+@dataclass(frozen=True)
 class AdductInfo:
+    __slots__ = ('name', 'mass_delta', 'charge', 'polarity')
     name: str
     mass_delta: float
     charge: int
     polarity: str
 
+# Adduct definitions per charge state, keyed by the CLI/GUI adduct name
+ADDUCT_MAP = MappingProxyType({
+    1: MappingProxyType({
+        '[M+H]+': AdductInfo("[M+H]1+", PROTON_MASS, 1, "positive"),
+        '[M-H]-': AdductInfo("[M-H]1-", -PROTON_MASS, -1, "negative"),
+        '[M+Na]+': AdductInfo("[M+Na]1+", 22.98976928, 1, "positive"),
+        '[M+NH4]+': AdductInfo("[M+NH4]1+", 18.03383, 1, "positive"),
+        '[M+CH3COO]-': AdductInfo("[M+CH3COO]1-", 59.013851, -1, "negative"),
+        '[M+HCOO]-': AdductInfo("[M+HCOO]1-", 44.998201, -1, "negative"),
+    }),
+    2: MappingProxyType({
+        '[M+2H]2+': AdductInfo("[M+2H]2+", 2 * PROTON_MASS, 2, "positive"),
+        '[M-2H]2-': AdductInfo("[M-2H]2-", -2 * PROTON_MASS, -2, "negative"),
+        '[M+H+Na]2+': AdductInfo("[M+H+Na]2+", PROTON_MASS + 22.98976928, 2, "positive"),
+        '[M+2Na]2+': AdductInfo("[M+2Na]2+", 2 * 22.98976928, 2, "positive"),
+    }),
+    3: MappingProxyType({
+        '[M+3H]3+': AdductInfo("[M+3H]3+", 3 * PROTON_MASS, 3, "positive"),
+        '[M-3H]3-': AdductInfo("[M-3H]3-", -3 * PROTON_MASS, -3, "negative"),
+        '[M+2H+Na]3+': AdductInfo("[M+2H+Na]3+", 2 * PROTON_MASS + 22.98976928, 3, "positive"),
+        '[M+H+2Na]3+': AdductInfo("[M+H+2Na]3+", PROTON_MASS + 2 * 22.98976928, 3, "positive"),
+        '[M+3Na]3+': AdductInfo("[M+3Na]3+", 3 * 22.98976928, 3, "positive"),
+    }),
+    4: MappingProxyType({
+        '[M+4H]4+': AdductInfo('[M+4H]4+', 4*PROTON_MASS, 4, 'positive'),
+        '[M-4H]4-': AdductInfo('[M-4H]4-', -4*PROTON_MASS, -4, 'negative'),
+    }),
+    5: MappingProxyType({
+        '[M+5H]5+': AdductInfo('[M+5H]5+', 5*PROTON_MASS, 5, 'positive'),
+        '[M-5H]5-': AdductInfo('[M-5H]5-', -5*PROTON_MASS, -5, 'negative'),
+    }),
+})
+
+# Protonated/deprotonated pair used for each charge state when no adducts are selected
+DEFAULT_ADDUCTS = MappingProxyType({
+    1: (ADDUCT_MAP[1]['[M+H]+'], ADDUCT_MAP[1]['[M-H]-']),
+    2: (ADDUCT_MAP[2]['[M+2H]2+'], ADDUCT_MAP[2]['[M-2H]2-']),
+    3: (ADDUCT_MAP[3]['[M+3H]3+'], ADDUCT_MAP[3]['[M-3H]3-']),
+    4: (ADDUCT_MAP[4]['[M+4H]4+'], ADDUCT_MAP[4]['[M-4H]4-']),
+    5: (ADDUCT_MAP[5]['[M+5H]5+'], ADDUCT_MAP[5]['[M-5H]5-']),
+})
+
 def get_adduct_definitions(charge_states: List[int] = [1],
                           selected_adducts: Optional[List[str]] = None) -> List[AdductInfo]:
     """Get adduct definitions for specified charge states and adduct types"""
-    all_adducts = []
-
-    adduct_map = {
-        1: {
-            '[M+H]+': AdductInfo("[M+H]1+", PROTON_MASS, 1, "positive"),
-            '[M-H]-': AdductInfo("[M-H]1-", -PROTON_MASS, -1, "negative"),
-            '[M+Na]+': AdductInfo("[M+Na]1+", 22.98976928, 1, "positive"),
-            '[M+NH4]+': AdductInfo("[M+NH4]1+", 18.03383, 1, "positive"),
-            '[M+CH3COO]-': AdductInfo("[M+CH3COO]1-", 59.013851, -1, "negative"),
-            '[M+HCOO]-': AdductInfo("[M+HCOO]1-", 44.998201, -1, "negative"),
-        },
-        2: {
-            '[M+2H]2+': AdductInfo("[M+2H]2+", 2 * PROTON_MASS, 2, "positive"),
-            '[M-2H]2-': AdductInfo("[M-2H]2-", -2 * PROTON_MASS, -2, "negative"),
-            '[M+H+Na]2+': AdductInfo("[M+H+Na]2+", PROTON_MASS + 22.98976928, 2, "positive"),
-            '[M+2Na]2+': AdductInfo("[M+2Na]2+", 2 * 22.98976928, 2, "positive"),
-        },
-        3: {
-            '[M+3H]3+': AdductInfo("[M+3H]3+", 3 * PROTON_MASS, 3, "positive"),
-            '[M-3H]3-': AdductInfo("[M-3H]3-", -3 * PROTON_MASS, -3, "negative"),
-            '[M+2H+Na]3+': AdductInfo("[M+2H+Na]3+", 2 * PROTON_MASS + 22.98976928, 3, "positive"),
-            '[M+H+2Na]3+': AdductInfo("[M+H+2Na]3+", PROTON_MASS + 2 * 22.98976928, 3, "positive"),
-            '[M+3Na]3+': AdductInfo("[M+3Na]3+", 3 * 22.98976928, 3, "positive"),
-        },
-        4: {
-            '[M+4H]4+': AdductInfo('[M+4H]4+', 4*PROTON_MASS, 4, 'positive'),
-            '[M-4H]4-': AdductInfo('[M-4H]4-', -4*PROTON_MASS, -4, 'negative'),
-        },
-        5: {
-            '[M+5H]5+': AdductInfo('[M+5H]5+', 5*PROTON_MASS, 5, 'positive'),
-            '[M-5H]5-': AdductInfo('[M-5H]5-', -5*PROTON_MASS, -5, 'negative'),
-        }
-    }
+    selected = None if selected_adducts is None else tuple(selected_adducts)
+    return list(_adduct_definitions(tuple(charge_states), selected))
 
+@lru_cache(maxsize=128)
+def _adduct_definitions(charge_states: tuple, selected_adducts: Optional[tuple]) -> tuple:
+    """Cached body of get_adduct_definitions, keyed by tuples"""
     if selected_adducts is None:
-        for charge in charge_states:
-            if charge == 1:
-                all_adducts.extend([
-                    adduct_map[1]['[M+H]+'],
-                    adduct_map[1]['[M-H]-'],
-                ])
-            elif charge == 2:
-                all_adducts.extend([
-                    adduct_map[2]['[M+2H]2+'],
-                    adduct_map[2]['[M-2H]2-'],
-                ])
-            elif charge == 3:
-                all_adducts.extend([
-                    adduct_map[3]['[M+3H]3+'],
-                    adduct_map[3]['[M-3H]3-'],
-                ])
-            elif charge == 4:
-                all_adducts.extend([
-                    adduct_map[4]['[M+4H]4+'],
-                    adduct_map[4]['[M-4H]4-'],
-                ])
-            elif charge == 5:
-                all_adducts.extend([
-                    adduct_map[5]['[M+5H]5+'],
-                    adduct_map[5]['[M-5H]5-'],
-                ])
+        return tuple(adduct for charge in charge_states
+                     for adduct in DEFAULT_ADDUCTS.get(charge, ()))
 
-    else:
-        for adduct_name in selected_adducts:
-            for charge in charge_states:
-                if charge in adduct_map and adduct_name in adduct_map[charge]:
-                    all_adducts.append(adduct_map[charge][adduct_name])
+    return tuple(ADDUCT_MAP[charge][adduct_name]
+                 for adduct_name in selected_adducts
+                 for charge in charge_states
+                 if charge in ADDUCT_MAP and adduct_name in ADDUCT_MAP[charge])
 
-    return all_adducts
+# GSL size categories for recommended charge states
+SMALL_GSL_CLASSES = frozenset({'Hex', 'SM4', 'Lac', 'SHex2', 'LC3', 'LC4', 'GA1', 'GA2', 'GM3', 'GM2', 'GM1'})
+MEDIUM_GSL_CLASSES = frozenset({'GD3'})
+LARGE_GSL_CLASSES = frozenset({'GD2', 'GD1a', 'GD1b', 'GD1c', 'GT3', 'GT2'})
+VERY_LARGE_GSL_CLASSES = frozenset({'GT1a', 'GT1b', 'GQ1', 'GP1'})
 
 def get_recommended_charges_for_lipid(lipid_class: str) -> List[int]:
     """Get recommended charge states based on lipid class"""
     if LipidDatabase.is_ceramide_class(lipid_class):
         return [1]
-    else:
-        small_gsl = ['Hex', 'SM4', 'Lac', 'SHex2', 'LC3', 'LC4', 'GA1', 'GA2', 'GM3', 'GM2', 'GM1']
-        medium_gsl = ['GD3']
-        large_gsl = ['GD2', 'GD1a', 'GD1b', 'GD1c', 'GT3', 'GT2']
-        very_large_gsl = ['GT1a', 'GT1b', 'GQ1', 'GP1']
-
-        if lipid_class in small_gsl:
-            return [1]
-        elif lipid_class in medium_gsl:
-            return [1, 2]
-        elif lipid_class in large_gsl:
+    elif lipid_class in SMALL_GSL_CLASSES:
+        return [1]
+    elif lipid_class in MEDIUM_GSL_CLASSES:
+        return [1, 2]
+    elif lipid_class in LARGE_GSL_CLASSES:
+        return [2, 3]
+    elif lipid_class in VERY_LARGE_GSL_CLASSES:
+        if lipid_class == 'GP1':
+            return [3, 4, 5]
+        elif lipid_class == 'GQ1':
+            return [3, 4]
+        else:  # GT1a, GT1b
             return [2, 3]
-        elif lipid_class in very_large_gsl:
-            if lipid_class == 'GP1':
-                return [3, 4, 5]
-            elif lipid_class == 'GQ1':
-                return [3, 4]
-            else:  # GT1a, GT1b
-                return [2, 3]
-        else:
-            return [1, 2]
+    else:
+        return [1, 2]
 
 def generate_lipid_formulas(lipid_class: str,
                            selected_lcbs: Optional[List[str]] = None,
@@ -500,7 +394,8 @@ def generate_lipid_formulas(lipid_class: str,
     else:
         lcb_list = ConfigManager.get_lcb_list(lipid_class)
 
-    lcb_variations = {}
+    # LCB and FA compositions as count rows in ELEMENT_ORDER
+    lcb_names, lcb_rows = [], []
     for lcb in lcb_list:
         parts = lcb.split(':')
         if len(parts) == 2:
@@ -510,48 +405,40 @@ def generate_lipid_formulas(lipid_class: str,
             hydroxyls = int(unsat_hydox[1]) if len(unsat_hydox) > 1 else (1 if lipid_class == 'doxCer' else 2)
 
             hydrogens = 2 * carbons + 3 - 2 * unsaturations
-            lcb_variations[lcb] = {
-                'C': carbons,
-                'H': hydrogens,
-                'N': 1,
-                'O': hydroxyls
-            }
+            lcb_names.append(lcb)
+            lcb_rows.append((carbons, hydrogens, 1, hydroxyls, 0, 0))
 
     if selected_fatty_acids:
         fa_list = selected_fatty_acids
     else:
         fa_list = ConfigManager.get_fatty_acid_list()
 
-    fatty_acids = {}
+    fa_names, fa_rows = [], []
     for fa in fa_list:
         parts = fa.split(':')
         if len(parts) == 2:
             carbons = int(parts[0])
             unsaturations = int(parts[1])
             hydrogens = 2 * carbons - 2 * unsaturations
-            fatty_acids[fa] = {'C': carbons, 'H': hydrogens, 'O': 2}
+            fa_names.append(fa)
+            fa_rows.append((carbons, hydrogens, 0, 2, 0, 0))
 
+    # Amide condensation (-H2O) plus the headgroup, added to every LCB x FA pair
     headgroup_comp = LipidDatabase.get_lipid_composition(lipid_class)
+    if not lcb_names or not fa_names:
+        return formulas
+
+    offset = np.array([headgroup_comp.get(element, 0) for element in ELEMENT_ORDER], dtype=np.int32)
+    offset -= (0, 2, 0, 1, 0, 0)
 
-    for lcb_name, lcb_comp in lcb_variations.items():
-        for fa_name, fa_comp in fatty_acids.items():
-            ceramide_backbone = {
-                'C': lcb_comp['C'] + fa_comp['C'],
-                'H': lcb_comp['H'] + fa_comp['H'] - 2,
-                'N': lcb_comp['N'],
-                'O': lcb_comp['O'] + fa_comp['O'] - 1
-            }
-
-            final_formula = {
-                'C': ceramide_backbone['C'] + headgroup_comp['C'],
-                'H': ceramide_backbone['H'] + headgroup_comp['H'],
-                'N': ceramide_backbone['N'] + headgroup_comp.get('N', 0),
-                'O': ceramide_backbone['O'] + headgroup_comp['O'],
-                'P': headgroup_comp.get('P', 0),
-                'S': headgroup_comp.get('S', 0)
-            }
+    n_elements = len(ELEMENT_ORDER)
+    lcb_arr = np.array(lcb_rows, dtype=np.int32).reshape(-1, n_elements)
+    fa_arr = np.array(fa_rows, dtype=np.int32).reshape(-1, n_elements)
+    counts = lcb_arr[:, None, :] + fa_arr[None, :, :] + offset
 
+    for lcb_name, lcb_counts in zip(lcb_names, counts.tolist()):
+        for fa_name, row in zip(fa_names, lcb_counts):
             species_name = f"{lcb_name}/{fa_name}"
-            formulas[species_name] = MolecularFormula(final_formula)
+            formulas[species_name] = MolecularFormula(dict(zip(ELEMENT_ORDER, row)))
 
     return formulas
@@ -1,6 +1,12 @@
 from typing import Dict, List, Tuple, Optional
+import copy
 import json
+import os
+import tempfile
+from functools import lru_cache
+from itertools import product
 from pathlib import Path
+from chemistry import MolecularFormula
 
 class LipidDatabase:
     """Lipid database - ALL formulas verified or calculated from verified structures"""
@@ -45,6 +51,76 @@ class LipidDatabase:
         'SM': {'C': 5, 'H': 12, 'N': 1, 'O': 3, 'P': 1},
     }
 
+    # Monoisotopic mass of each headgroup composition, computed once at class load
+    HEADGROUP_MASSES = {
+        name: MolecularFormula(comp).mass()
+        for compositions in (GSL_HEADGROUP_COMPOSITIONS, CERAMIDE_COMPOSITIONS, SM_COMPOSITIONS)
+        for name, comp in compositions.items()
+    }
+
+    # Display metadata per lipid class
+    MW_RANGES = {
+        'Hex': '600-900',
+        'Lac': '700-800', 'LC3': '900-1000', 'LC4': '1100-1200',
+        'Gb3': '1000-1100', 'Gb4': '1200-1400',
+        'GA2': '1000-1100', 'GA1': '1200-1400',
+        'GM4': '1000-1200',
+        'GM3': '1200-1300', 'GM2': '1400-1500', 'GM1': '1500-1600',
+        'GD3': '1500-1600', 'GD2': '1700-1800', 'GD1a': '1800-1900', 'GD1b': '1800-1900',
+        'GT3': '1700-1900', 'GT2': '1900-2100', 'GT1a': '2000-2400', 'GT1b': '2000-2400', 'GT1c': '2000-2400',
+        'GQ1': '2300-2400', 'GP1': '2600-2700',
+        'Cer': '500-750', 'doxCer': '480-730',
+        'SM': '650-900', 'SM4': '700-1100',
+        'nLc10': '2200-2500',
+        'nLc8': '1900-2200',
+        'nLc6': '1500-1800',
+        'SHex2': '700-1100',
+    }
+
+    SIALIC_ACID_COUNTS = {
+        'GM4': 1, 'GM3': 1, 'GM2': 1, 'GM1': 1,
+        'GD3': 2, 'GD2': 2, 'GD1a': 2, 'GD1b': 2,
+        'GT3': 3, 'GT2': 3, 'GT1a': 3, 'GT1b': 3, 'GT1c': 3,
+        'GQ1': 4, 'GP1': 5
+    }
+
+    STRUCTURE_DESCRIPTIONS = {
+        'doxCer': 'headless, 1-deoxy-Ceramide',
+        'Cer': 'Ceramide',
+        'Hex': 'β-D-Glc- or β-D-Gal-linked Ceramide (Hexosylceramide)',
+        'SM4': '3-O-sulfated Gal-Cer (Sulfatide)',
+        'Lac': 'Galβ1-4Glc-Cer (Lactosyl-Ceramide)',
+        'LC3': 'GlcNAcβ1-3Galβ1-4Glc-Cer (Lacto/neoLacto-series), isobaric to GA2',
+        'LC4': 'Galβ1-3GlcNAcβ1-3Galβ1-4Glc-Cer (Lacto-series)',
+        'Gb3': 'Galα1-4Galβ1-4Glc-Cer (Globotriaosylceramide)',
+        'Gb4': 'GalNAcβ1-3Galα1-4Galβ1-4Glc-Cer (isobaric to GA1)',
+        'GA2': 'GalNAcβ1-4Galβ1-4Glc-Cer (asialo-GM2), isobaric to Lc3',
+        'GA1': 'Galβ1-3GalNAcβ1-4Galβ1-4Glc-Cer (asialo-GM1)',
+        'GM4': 'Neu5Acα2-3Galβ-Cer',
+        'GM3': 'NeuAcα2-3Galβ1-4Glcβ-Cer',
+        'GM2': 'GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'GM1': 'Galβ1-3GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'GD3': 'NeuAcα2-8NeuAcα2-3Galβ1-4Glcβ-Cer',
+        'GD2': 'GalNAcβ1-4(NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'GD1a': 'NeuAcα2-3Galβ1-3GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'GD1b': 'Galβ1-3GalNAcβ1-4(NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'GT3': 'Neu5Acα2-8Neu5Acα2-8Neu5Acα2-3Galβ1-4Glcβ-Cer',
+        'GT2': 'GalNAcβ1-4(Neu5Acα2-8Neu5Acα2-8Neu5Acα2-3)Galβ1-4Glcβ-Cer',
+        'GT1a': 'Neu5Acα2-8Neu5Acα2-3Galβ1-3GalNAcβ1-4(Neu5Acα2-3)Galβ1-4Glcβ-Cer',
+        'GT1b': 'Neu5Acα2-3Galβ1-3GalNAcβ1-4(Neu5Acα2-8Neu5Acα2-3)Galβ1-4Glcβ-Cer',
+        'GT1c': 'Galβ1-3GalNAcβ1-4(NeuAcα2-8NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
+        'SM': 'Phosphocholine-Cer (Sphingomyelin)',
+        'nLc10': 'GlcNAcβ1-3Galβ1-4GlcNAcβ1-3(Galα1-3Galβ1-4GlcNAcβ1-6)Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
+        'nLc8': 'Galβ1-4GlcNAcβ1-3(Galβ1-4GlcNAcβ1-6)Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
+        'nLc6': 'Galβ1-4GlcNAcβ1-3Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
+        'SHex2': 'Sulfated dihexosylceramide',
+    }
+
+    # Class lists for membership tests and listings, built once
+    ALL_CLASSES = tuple(sorted([*GSL_HEADGROUP_COMPOSITIONS, *CERAMIDE_COMPOSITIONS, *SM_COMPOSITIONS]))
+    CERAMIDE_CLASSES = frozenset(CERAMIDE_COMPOSITIONS)
+    GSL_CLASSES = frozenset(GSL_HEADGROUP_COMPOSITIONS)
+
     @classmethod
     def get_lipid_composition(cls, lipid_class: str) -> Dict[str, int]:
         if lipid_class in cls.GSL_HEADGROUP_COMPOSITIONS:
@@ -56,86 +132,37 @@ class LipidDatabase:
         else:
             raise ValueError(f"Unknown lipid class: {lipid_class}")
 
+    @classmethod
+    def get_lipid_mass(cls, lipid_class: str) -> float:
+        """Precomputed monoisotopic mass of the headgroup composition"""
+        try:
+            return cls.HEADGROUP_MASSES[lipid_class]
+        except KeyError:
+            raise ValueError(f"Unknown lipid class: {lipid_class}") from None
+
     @classmethod
     def get_all_classes(cls) -> List[str]:
-        gsl_classes = list(cls.GSL_HEADGROUP_COMPOSITIONS.keys())
-        ceramide_classes = list(cls.CERAMIDE_COMPOSITIONS.keys())
-        sm_classes = list(cls.SM_COMPOSITIONS.keys())
-        return sorted(gsl_classes + ceramide_classes + sm_classes)
+        return list(cls.ALL_CLASSES)
 
     @classmethod
     def is_ceramide_class(cls, lipid_class: str) -> bool:
-        return lipid_class in cls.CERAMIDE_COMPOSITIONS
+        return lipid_class in cls.CERAMIDE_CLASSES
 
     @classmethod
     def is_gsl_class(cls, lipid_class: str) -> bool:
-        return lipid_class in cls.GSL_HEADGROUP_COMPOSITIONS
+        return lipid_class in cls.GSL_CLASSES
 
     @classmethod
     def molecular_weight_range(cls, lipid_class: str) -> str:
-        mw_ranges = {
-            'Hex': '600-900',
-            'Lac': '700-800', 'LC3': '900-1000', 'LC4': '1100-1200',
-            'Gb3': '1000-1100', 'Gb4': '1200-1400',
-            'GA2': '1000-1100', 'GA1': '1200-1400',
-            'GM4': '1000-1200',
-            'GM3': '1200-1300', 'GM2': '1400-1500', 'GM1': '1500-1600',
-            'GD3': '1500-1600', 'GD2': '1700-1800', 'GD1a': '1800-1900', 'GD1b': '1800-1900',
-            'GT3': '1700-1900', 'GT2': '1900-2100', 'GT1a': '2000-2400', 'GT1b': '2000-2400', 'GT1c': '2000-2400',
-            'GQ1': '2300-2400', 'GP1': '2600-2700',
-            'Cer': '500-750', 'doxCer': '480-730',
-            'SM': '650-900', 'SM4': '700-1100',
-            'nLc10': '2200-2500',
-            'nLc8': '1900-2200',
-            'nLc6': '1500-1800',
-            'SHex2': '700-1100',
-        }
-        return mw_ranges.get(lipid_class, '500-2000')
+        return cls.MW_RANGES.get(lipid_class, '500-2000')
 
     @classmethod
     def get_sialic_acid_count(cls, lipid_class: str) -> int:
-        sialic_counts = {
-            'GM4': 1, 'GM3': 1, 'GM2': 1, 'GM1': 1,
-            'GD3': 2, 'GD2': 2, 'GD1a': 2, 'GD1b': 2,
-            'GT3': 3, 'GT2': 3, 'GT1a': 3, 'GT1b': 3, 'GT1c': 3,
-            'GQ1': 4, 'GP1': 5
-        }
-        return sialic_counts.get(lipid_class, 0)
+        return cls.SIALIC_ACID_COUNTS.get(lipid_class, 0)
 
     @classmethod
     def get_structure_description(cls, lipid_class: str) -> str:
-        structures = {
-            'doxCer': 'headless, 1-deoxy-Ceramide',
-            'Cer': 'Ceramide',
-            'Hex': 'β-D-Glc- or β-D-Gal-linked Ceramide (Hexosylceramide)',
-            'SM4': '3-O-sulfated Gal-Cer (Sulfatide)',
-            'Lac': 'Galβ1-4Glc-Cer (Lactosyl-Ceramide)',
-            'LC3': 'GlcNAcβ1-3Galβ1-4Glc-Cer (Lacto/neoLacto-series), isobaric to GA2',
-            'LC4': 'Galβ1-3GlcNAcβ1-3Galβ1-4Glc-Cer (Lacto-series)',
-            'Gb3': 'Galα1-4Galβ1-4Glc-Cer (Globotriaosylceramide)',
-            'Gb4': 'GalNAcβ1-3Galα1-4Galβ1-4Glc-Cer (isobaric to GA1)',
-            'GA2': 'GalNAcβ1-4Galβ1-4Glc-Cer (asialo-GM2), isobaric to Lc3',
-            'GA1': 'Galβ1-3GalNAcβ1-4Galβ1-4Glc-Cer (asialo-GM1)',
-            'GM4': 'Neu5Acα2-3Galβ-Cer',
-            'GM3': 'NeuAcα2-3Galβ1-4Glcβ-Cer',
-            'GM2': 'GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'GM1': 'Galβ1-3GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'GD3': 'NeuAcα2-8NeuAcα2-3Galβ1-4Glcβ-Cer',
-            'GD2': 'GalNAcβ1-4(NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'GD1a': 'NeuAcα2-3Galβ1-3GalNAcβ1-4(NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'GD1b': 'Galβ1-3GalNAcβ1-4(NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'GT3': 'Neu5Acα2-8Neu5Acα2-8Neu5Acα2-3Galβ1-4Glcβ-Cer',
-            'GT2': 'GalNAcβ1-4(Neu5Acα2-8Neu5Acα2-8Neu5Acα2-3)Galβ1-4Glcβ-Cer',
-            'GT1a': 'Neu5Acα2-8Neu5Acα2-3Galβ1-3GalNAcβ1-4(Neu5Acα2-3)Galβ1-4Glcβ-Cer',
-            'GT1b': 'Neu5Acα2-3Galβ1-3GalNAcβ1-4(Neu5Acα2-8Neu5Acα2-3)Galβ1-4Glcβ-Cer',
-            'GT1c': 'Galβ1-3GalNAcβ1-4(NeuAcα2-8NeuAcα2-8NeuAcα2-3)Galβ1-4Glcβ-Cer',
-            'SM': 'Phosphocholine-Cer (Sphingomyelin)',
-            'nLc10': 'GlcNAcβ1-3Galβ1-4GlcNAcβ1-3(Galα1-3Galβ1-4GlcNAcβ1-6)Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
-            'nLc8': 'Galβ1-4GlcNAcβ1-3(Galβ1-4GlcNAcβ1-6)Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
-            'nLc6': 'Galβ1-4GlcNAcβ1-3Galβ1-4GlcNAcβ1-3Galβ1-4Glcβ-Cer',
-            'SHex2': 'Sulfated dihexosylceramide',
-        }
-        return structures.get(lipid_class, 'Structure not specified')
+        return cls.STRUCTURE_DESCRIPTIONS.get(lipid_class, 'Structure not specified')
 
 class ConfigManager:
     """Manage user configuration for LCB and fatty acid selections"""
@@ -169,61 +196,125 @@ class ConfigManager:
         "selected_fatty_acids": None
     }
 
+    # Parsed config file, keyed by the file's (mtime, size, inode): mtime alone
+    # misses same-tick edits on filesystems with coarse timestamps
+    _cache = None
+    _cache_key = None
+
     @classmethod
-    def load_config(cls):
-        """Load configuration from file, or create default"""
-        config_path = Path(cls.CONFIG_FILE)
-        if config_path.exists():
+    def _cached_config(cls):
+        """
+        Parsed configuration, shared and read-only.
+        The file is only re-read when its modification time, size or inode changes.
+        """
+        try:
+            st = Path(cls.CONFIG_FILE).stat()
+        except OSError:
+            return cls.DEFAULT_CONFIG
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if key != cls._cache_key:
             try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
+                with open(cls.CONFIG_FILE, 'r') as f:
+                    cls._cache = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError, KeyError):
-                return cls.DEFAULT_CONFIG.copy()
-        return cls.DEFAULT_CONFIG.copy()
+                cls._cache = cls.DEFAULT_CONFIG
+            cls._cache_key = key
+        return cls._cache
+
+    @classmethod
+    def load_config(cls):
+        """Load configuration from file, or create default (caller may modify the result)"""
+        return copy.deepcopy(cls._cached_config())
 
     @classmethod
     def save_config(cls, config):
-        """Save configuration to file"""
-        with open(cls.CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        """
+        Save configuration to file.
+        Written to a temporary file first and moved over the config with
+        os.replace, so an interrupted save never leaves a truncated file.
+        """
+        # Serialized up front and written with a single write() call
+        payload = json.dumps(config, indent=2).encode('utf-8')
+        # A symlinked config is updated at its destination, not replaced by a file
+        target = Path(cls.CONFIG_FILE).resolve()
+        mode = cls._config_file_mode(target)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.cfg.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # mkstemp creates the file as 0600; give it the mode the config has
+                os.chmod(tmp, mode)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        cls._cache_key = None
+
+    @staticmethod
+    def _config_file_mode(target: Path) -> int:
+        """Permission bits of the existing config, or the umask default for a new one"""
+        try:
+            return target.stat().st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
 
     @classmethod
     def get_lcb_list(cls, lipid_class="standard"):
         """Get LCB list for given lipid class"""
-        config = cls.load_config()
+        config = cls._cached_config()
         key = "doxCer" if lipid_class == "doxCer" else "standard"
-        return config["lcb_selections"][key]
+        return list(config["lcb_selections"][key])
 
     @classmethod
     def get_fatty_acid_list(cls):
         """Get fatty acid list based on configuration"""
-        config = cls.load_config()
+        config = cls._cached_config()
 
         if config.get("selected_fatty_acids"):
-            return config["selected_fatty_acids"]
+            return list(config["selected_fatty_acids"])
 
         fa_config = config["fatty_acid_range"]
-        fatty_acids = []
+        return list(cls._build_fatty_acid_list(
+            fa_config["min_length"],
+            fa_config["max_length"],
+            tuple(fa_config["unsaturations"]),
+            fa_config.get("even_chain_only", False),
+        ))
 
-        # Get chain length range
-        min_len = fa_config["min_length"]
-        max_len = fa_config["max_length"]
-        even_only = fa_config.get("even_chain_only", False)
-
-        # Generate fatty acid list
-        for length in range(min_len, max_len + 1):
-            # Skip odd-chain lengths if even_only is True
-            if even_only and length % 2 != 0:
-                continue
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _build_fatty_acid_list(min_len: int, max_len: int, unsaturations: Tuple[int, ...],
+                               even_only: bool) -> Tuple[str, ...]:
+        """Fatty acid names for a chain-length range, cached per range settings"""
+        if even_only:
+            lengths = range(min_len + min_len % 2, max_len + 1, 2)  # Skip odd-chain lengths
+        else:
+            lengths = range(min_len, max_len + 1)
+        return tuple(f"{length}:{unsat}" for length, unsat in product(lengths, unsaturations))
 
-            for unsat in fa_config["unsaturations"]:
-                fatty_acids.append(f"{length}:{unsat}")
+    @classmethod
+    def get_default_config(cls):
+        """Get complete default configuration including UI state (caller may modify the result)"""
+        return copy.deepcopy(cls._default_config())
 
-        return fatty_acids
+    @classmethod
+    def reset_config(cls):
+        """Write the default configuration, unless the file already holds it"""
+        defaults = cls._default_config()
+        if cls._cached_config() != defaults:
+            cls.save_config(defaults)
 
     @classmethod
-    def get_default_config(cls):
-        """Get complete default configuration including UI state"""
+    @lru_cache(maxsize=1)
+    def _default_config(cls):
+        """Default configuration including UI state, built once; shared and read-only"""
         return {
             "lcb_selections": {
                 "standard": ["18:0;2", "18:1;2", "18:2;2"],
@@ -12,16 +12,16 @@ email: andreas.huelsmeier@uzh.ch
 status: Prototype
 """
 
-import pandas as pd
-import argparse
 import sys
 import os
 import logging
 
 # Configure logging
-log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+log_level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+if not isinstance(log_level, int):
+    log_level = logging.INFO  # Unknown level name, fall back to INFO
 logging.basicConfig(
-    level=getattr(logging, log_level),
+    level=log_level,
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
@@ -31,11 +31,13 @@ logger = logging.getLogger(__name__)
 # MODULE ROUTER (Pass-throughs for the GUI)
 # ============================================================================
 from constants import ATOMIC_MASSES, ISOTOPE_DELTAS, ADDUCT_INSERT_RE
-from chemistry import parse_isotope_label, calculate_isotope_mass_shift, filter_isotope_token, MolecularFormula
+from chemistry import (parse_isotope_label, calculate_isotope_mass_shift, calculate_isotope_mass_shifts,
+                       filter_isotope_token, MolecularFormula, formula_mass)
 from fragment_rules import GSLFragmentRules, NegativeFragmentRules, CeramideFragmentRules
 from database import LipidDatabase, ConfigManager
-from core_transitions import generate_transitions, get_recommended_charges_for_lipid
-from isotope_labeling import add_isotope_labels, blank_mz_values
+from core_transitions import (generate_transitions, generate_transition_rows,
+                              get_recommended_charges_for_lipid, TRANSITION_COLUMNS)
+from isotope_labeling import add_isotope_labels, blank_mz_values, post_process
 
 # Expose these specifically for the GUI's configuration dialog
 if hasattr(ConfigManager, 'SUPPORTED_STANDARD_LCBS'):
@@ -46,8 +48,20 @@ if hasattr(ConfigManager, 'SUPPORTED_DOX_LCBS'):
 # ============================================================================
 # COMMAND LINE INTERFACE
 # ============================================================================
+def write_transitions_csv(rows, path, columns=TRANSITION_COLUMNS):
+    """Write transition row tuples to CSV in the same layout as DataFrame.to_csv(index=False)"""
+    import csv
+    with open(path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
 def main():
     """CLI interface"""
+    # Deferred so that importing this module (e.g. from the GUI) stays cheap
+    import argparse
+    import pandas as pd
+
     parser = argparse.ArgumentParser(
         description='GSL + Ceramide Transition Generator v1.1.0 - WITH CONFIGURABLE CHAINS',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -109,24 +123,38 @@ Examples:
     if args.adducts:
         print(f"🔬 Selected adducts: {', '.join(args.adducts)}")
 
-    transitions = generate_transitions(args.lipid_class, args.charge_states, args.adducts)
-    df = pd.DataFrame(transitions)
+    transitions = generate_transition_rows(args.lipid_class, args.charge_states, args.adducts)
     print(f"✅ Generated {len(transitions)} base transitions")
-
+    logger.debug("formula_mass cache: %s", formula_mass.cache_info())
+
+    if not (args.add_labels or args.blank_mz):
+        # Plain output: write the rows straight through, no DataFrame needed
+        write_transitions_csv(transitions, args.output)
+        print(f"💾 Saved to: {os.path.abspath(args.output)}")
+        if args.verbose:
+            print(f"\n📈 Sample transitions:")
+            df = pd.DataFrame.from_records(transitions[:10], columns=TRANSITION_COLUMNS)
+            sample_cols = ['Molecule', 'Precursor Adduct', 'Precursor m/z', 'Product Name', 'Product m/z']
+            print(df[sample_cols].to_string(index=False))
+        return
+
+    df = pd.DataFrame.from_records(transitions, columns=TRANSITION_COLUMNS)
+
+    labels = None
     if args.add_labels:
         print(f"🏷️  Adding isotope labels...")
-        df = add_isotope_labels(
-            df,
+        labels = dict(
             isotope=args.isotope,
             doxcer_isotope=args.doxcer_isotope,
             cer_isotope=args.cer_isotope,
             lcb=args.lcb
         )
-        print(f"🏷️  Final: {len(df)} transitions (light/heavy)")
-
     if args.blank_mz:
         print(f"🧹 Blanking all m/z values...")
-        df = blank_mz_values(df)
+
+    df = post_process(df, labels=labels, blank=args.blank_mz)
+    if args.add_labels:
+        print(f"🏷️  Final: {len(df)} transitions (light/heavy)")
 
     df.to_csv(args.output, index=False)
     print(f"💾 Saved to: {os.path.abspath(args.output)}")
@@ -13,14 +13,16 @@ __email__ = "andreas.huelsmeier@uzh.ch"
 __status__ = "Prototype"
 
 import sys
-import pandas as pd
+from collections import OrderedDict
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QComboBox,
-    QCheckBox, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QFileDialog, QMessageBox, QGroupBox,
+    QCheckBox, QHBoxLayout, QPushButton, QTableView,
+    QFileDialog, QMessageBox, QGroupBox,
     QLineEdit, QScrollArea, QTextEdit, QDialog, QListWidget,
-    QAbstractItemView, QSpinBox
+    QAbstractItemView, QSpinBox, QButtonGroup
 )
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
 from PySide6.QtGui import QIcon
 import gslgen
 import logging
@@ -34,6 +36,106 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# LCB options used if the backend does not expose its supported lists
+_FALLBACK_STANDARD_LCBS = ("16:0;2", "16:1;2", "17:0;2", "17:1;2",
+                           "18:0;2", "18:0;3", "18:1;2", "18:2;2",
+                           "19:0;2", "19:1;2", "20:0;2", "20:1;2")
+_FALLBACK_DOX_LCBS = ("16:0;1", "16:1;1", "17:0;1", "17:1;1",
+                      "18:0;1", "18:1;1", "18:2;1",
+                      "19:0;1", "19:1;1", "20:0;1", "20:1;1")
+
+# Adduct checkboxes per charge state: (charge, positive adducts, negative adducts)
+_ADDUCTS_BY_CHARGE = (
+    (1, ('[M+H]+', '[M+Na]+', '[M+NH4]+'), ('[M-H]-', '[M+CH3COO]-', '[M+HCOO]-')),
+    (2, ('[M+2H]2+', '[M+H+Na]2+', '[M+2Na]2+'), ('[M-2H]2-',)),
+    (3, ('[M+3H]3+', '[M+2H+Na]3+', '[M+H+2Na]3+', '[M+3Na]3+'), ('[M-3H]3-',)),
+    (4, ('[M+4H]4+',), ('[M-4H]4-',)),
+    (5, ('[M+5H]5+',), ('[M-5H]5-',)),
+)
+
+
+# Preview and status label styles, selected through the dynamic "state"
+# property so Qt parses the CSS once instead of on every update
+_STYLE_SHEET = """
+QLabel#preview_label {
+    font-weight: bold; font-size: 11pt; padding: 8px; border-radius: 4px;
+    color: #0066cc; background-color: #f0f8ff;
+}
+QLabel#preview_label[state="warning"] { color: #cc6600; background-color: #fff8e6; }
+QLabel#status_label[state="success"] {
+    color: green; font-weight: bold; background-color: #e8f5e9; padding: 5px; border-radius: 3px;
+}
+QLabel#status_label[state="error"] {
+    color: red; font-weight: bold; background-color: #ffebee; padding: 5px; border-radius: 3px;
+}
+QLabel#status_label[state="warning"] {
+    color: #ff9800; font-weight: bold; background-color: #fff3e0; padding: 5px; border-radius: 3px;
+}
+"""
+
+
+def _set_style_state(widget, state):
+    """Switch a widget's "state" property and re-apply the stylesheet if it changed"""
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+@lru_cache(maxsize=64)
+def _lipid_info_text(lipid_class):
+    """Info panel text for a lipid class, built once per class"""
+    structure = gslgen.LipidDatabase.get_structure_description(lipid_class)
+    mw_range = gslgen.LipidDatabase.molecular_weight_range(lipid_class)
+    sialic_count = gslgen.LipidDatabase.get_sialic_acid_count(lipid_class)
+
+    info = f"Structure: {structure}\n"
+    info += f"MW Range: {mw_range} Da\n"
+    if sialic_count > 0:
+        info += f"Sialic Acids: {sialic_count}"
+    return info
+
+
+class PandasModel(QAbstractTableModel):
+    """Read-only table model over a DataFrame; cells are formatted on demand"""
+
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        self._df = df
+        # Column arrays and header labels are taken once, so data() indexes
+        # plain arrays positionally instead of going through DataFrame.iat
+        self._columns = [df[col].to_numpy() for col in df.columns]
+        self._headers = [str(col) for col in df.columns]
+        # Columns holding only strings are displayed as-is, the rest via str()
+        from pandas.api.types import infer_dtype
+        self._text_columns = [infer_dtype(df[col], skipna=False) == 'string' for col in df.columns]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._df.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._df.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return None
+        value = self._columns[index.column()][index.row()]
+        if self._text_columns[index.column()]:
+            return value
+        if role == Qt.EditRole:
+            # Native Python number, so e.g. a sort proxy on EditRole compares numerically
+            return value.item() if hasattr(value, 'item') else value
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
+
 
 class ConfigDialog(QDialog):
     """Dialog for configuring LCB and fatty acid selections"""
@@ -43,7 +145,9 @@ class ConfigDialog(QDialog):
         self.setWindowTitle("Configure Lipid Chains")
         self.setMinimumSize(600, 500)
 
-        config = gslgen.ConfigManager.load_config()
+        # Kept so that save_and_close only replaces the chain settings and
+        # leaves the rest (charge states, isotope labelling, ...) as saved
+        self._config = config = gslgen.ConfigManager.load_config()
 
         layout = QVBoxLayout()
 
@@ -56,23 +160,12 @@ class ConfigDialog(QDialog):
 
         # FIX: Load options from backend (gslgen.py) instead of hardcoding
         # This ensures all supported chains defined in the backend are visible here
-        if hasattr(gslgen, 'SUPPORTED_STANDARD_LCBS'):
-            standard_options = gslgen.SUPPORTED_STANDARD_LCBS
-        else:
-            # Fallback if backend variable is missing
-            standard_options = ["16:0;2", "16:1;2", "17:0;2", "17:1;2",
-                                "18:0;2", "18:0;3", "18:1;2", "18:2;2",
-                                "19:0;2", "19:1;2", "20:0;2", "20:1;2"]
-
-        for lcb in standard_options:
-            self.lcb_list_standard.addItem(lcb)
+        standard_options = getattr(gslgen, 'SUPPORTED_STANDARD_LCBS', _FALLBACK_STANDARD_LCBS)
+        self.lcb_list_standard.addItems(standard_options)
 
         # Restore saved selections
-        current_std_selection = config["lcb_selections"].get("standard", [])
-        for i in range(self.lcb_list_standard.count()):
-            item = self.lcb_list_standard.item(i)
-            if item.text() in current_std_selection:
-                item.setSelected(True)
+        self._preselect(self.lcb_list_standard, standard_options,
+                        config["lcb_selections"].get("standard", []))
 
         layout.addWidget(self.lcb_list_standard)
 
@@ -82,23 +175,12 @@ class ConfigDialog(QDialog):
         self.lcb_list_doxcer.setSelectionMode(QAbstractItemView.MultiSelection)
 
         # FIX: Load options from backend
-        if hasattr(gslgen, 'SUPPORTED_DOX_LCBS'):
-            dox_options = gslgen.SUPPORTED_DOX_LCBS
-        else:
-            # Fallback
-            dox_options = ["16:0;1", "16:1;1", "17:0;1", "17:1;1",
-                           "18:0;1", "18:1;1", "18:2;1",
-                           "19:0;1", "19:1;1", "20:0;1", "20:1;1"]
-
-        for lcb in dox_options:
-            self.lcb_list_doxcer.addItem(lcb)
+        dox_options = getattr(gslgen, 'SUPPORTED_DOX_LCBS', _FALLBACK_DOX_LCBS)
+        self.lcb_list_doxcer.addItems(dox_options)
 
         # Restore saved selections
-        current_dox_selection = config["lcb_selections"].get("doxCer", [])
-        for i in range(self.lcb_list_doxcer.count()):
-            item = self.lcb_list_doxcer.item(i)
-            if item.text() in current_dox_selection:
-                item.setSelected(True)
+        self._preselect(self.lcb_list_doxcer, dox_options,
+                        config["lcb_selections"].get("doxCer", []))
 
         layout.addWidget(self.lcb_list_doxcer)
 
@@ -138,6 +220,8 @@ class ConfigDialog(QDialog):
             self.unsat_checkboxes[unsat] = checkbox
             unsat_layout.addWidget(checkbox)
         layout.addLayout(unsat_layout)
+        # Kept as a list for update_preview, which runs on every signal
+        self._unsat_cb_values = list(self.unsat_checkboxes.values())
 
         # Add visual separator
         separator = QLabel()
@@ -146,16 +230,15 @@ class ConfigDialog(QDialog):
 
         # Create preview label with styling
         self.preview_label = QLabel("Expected combinations: Calculating...")
-        self.preview_label.setStyleSheet(
-            "color: #0066cc; "
-            "font-weight: bold; "
-            "font-size: 11pt; "
-            "padding: 8px; "
-            "background-color: #f0f8ff; "
-            "border-radius: 4px;"
-        )
+        self.preview_label.setObjectName("preview_label")
         layout.addWidget(self.preview_label)
 
+        # Bursts of signals (e.g. dragging a spinbox) collapse into one recompute
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(50)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+
         # Connect all widgets to update the preview
         self.lcb_list_standard.itemSelectionChanged.connect(self.update_preview)
         self.lcb_list_doxcer.itemSelectionChanged.connect(self.update_preview)
@@ -166,7 +249,7 @@ class ConfigDialog(QDialog):
             checkbox.toggled.connect(self.update_preview)
 
         # Calculate initial preview
-        self.update_preview()
+        self._do_update_preview()
 
         # ========== INFO AND BUTTONS ==========
         info_label = QLabel("\nNote: Changes will be saved and used for all future generations.")
@@ -184,6 +267,14 @@ class ConfigDialog(QDialog):
 
         self.setLayout(layout)
 
+    @staticmethod
+    def _preselect(list_widget, options, selection):
+        """Select the rows of list_widget whose option is in selection"""
+        selection = set(selection)
+        for i, lcb in enumerate(options):
+            if lcb in selection:
+                list_widget.item(i).setSelected(True)
+
     def save_and_close(self):
         """Save configuration and close dialog"""
         min_length = self.fa_min_spin.value()
@@ -199,13 +290,8 @@ class ConfigDialog(QDialog):
             return
 
         # Get selected LCBs from both lists
-        selected_standard = [self.lcb_list_standard.item(i).text()
-                            for i in range(self.lcb_list_standard.count())
-                            if self.lcb_list_standard.item(i).isSelected()]
-
-        selected_doxcer = [self.lcb_list_doxcer.item(i).text()
-                          for i in range(self.lcb_list_doxcer.count())
-                          if self.lcb_list_doxcer.item(i).isSelected()]
+        selected_standard = [item.text() for item in self.lcb_list_standard.selectedItems()]
+        selected_doxcer = [item.text() for item in self.lcb_list_doxcer.selectedItems()]
 
         # Check if at least one LCB is selected
         if not selected_standard and not selected_doxcer:
@@ -220,20 +306,19 @@ class ConfigDialog(QDialog):
             QMessageBox.warning(self, "No Selection", "Please select at least one unsaturation level!")
             return
 
-        # Build config with separate standard and doxCer lists
-        config = {
-            "lcb_selections": {
-                "standard": selected_standard,
-                "doxCer": selected_doxcer
-            },
-            "fatty_acid_range": {
-                "min_length": self.fa_min_spin.value(),
-                "max_length": self.fa_max_spin.value(),
-                "unsaturations": selected_unsaturations,
-                "even_chain_only": self.even_chain_checkbox.isChecked()
-            },
-            "selected_fatty_acids": None
+        # Update the chain settings, with separate standard and doxCer lists
+        config = self._config
+        config["lcb_selections"] = {
+            "standard": selected_standard,
+            "doxCer": selected_doxcer
         }
+        config["fatty_acid_range"] = {
+            "min_length": self.fa_min_spin.value(),
+            "max_length": self.fa_max_spin.value(),
+            "unsaturations": selected_unsaturations,
+            "even_chain_only": self.even_chain_checkbox.isChecked()
+        }
+        config["selected_fatty_acids"] = None
 
         # Save
         gslgen.ConfigManager.save_config(config)
@@ -241,18 +326,15 @@ class ConfigDialog(QDialog):
         self.accept()
 
     def update_preview(self):
+        """Schedule a preview update; restarts the timer if one is pending"""
+        self._preview_timer.start()
+
+    def _do_update_preview(self):
         """Calculate and display expected number of combinations"""
         try:
-            # Count selected LCBs
-            lcb_standard_count = sum(
-                1 for i in range(self.lcb_list_standard.count())
-                if self.lcb_list_standard.item(i).isSelected()
-            )
-            lcb_doxcer_count = sum(
-                1 for i in range(self.lcb_list_doxcer.count())
-                if self.lcb_list_doxcer.item(i).isSelected()
-            )
-            total_lcb_count = lcb_standard_count + lcb_doxcer_count
+            # Count selected LCBs (one selectedItems() call per list)
+            total_lcb_count = (len(self.lcb_list_standard.selectedItems())
+                               + len(self.lcb_list_doxcer.selectedItems()))
 
             # Calculate fatty acid count
             fa_min = self.fa_min_spin.value()
@@ -262,17 +344,15 @@ class ConfigDialog(QDialog):
                 fa_count = 0
                 range_text = "(invalid range)"
             elif self.even_chain_checkbox.isChecked():
-                fa_count = len(range(fa_min, fa_max + 1, 2))
+                # Even lengths in [fa_min, fa_max], as in ConfigManager's list
+                fa_count = fa_max // 2 - (fa_min + 1) // 2 + 1
                 range_text = f"(even only: {fa_min}-{fa_max})"
             else:
                 fa_count = fa_max - fa_min + 1
                 range_text = f"({fa_min}-{fa_max})"
 
             # Count selected unsaturations
-            unsat_count = sum(
-                1 for checkbox in self.unsat_checkboxes.values()
-                if checkbox.isChecked()
-            )
+            unsat_count = sum(checkbox.isChecked() for checkbox in self._unsat_cb_values)
 
             # Calculate total
             total = total_lcb_count * fa_count * unsat_count
@@ -282,20 +362,14 @@ class ConfigDialog(QDialog):
                 self.preview_label.setText(
                     "⚠️ No combinations will be generated - check your selections"
                 )
-                self.preview_label.setStyleSheet(
-                    "color: #cc6600; font-weight: bold; font-size: 11pt; "
-                    "padding: 8px; background-color: #fff8e6; border-radius: 4px;"
-                )
+                _set_style_state(self.preview_label, "warning")
             else:
                 self.preview_label.setText(
                     f"📊 Expected combinations: {total:,}\n"
                     f"({total_lcb_count} LCBs × {fa_count} FAs {range_text} × "
                     f"{unsat_count} unsaturations)"
                 )
-                self.preview_label.setStyleSheet(
-                    "color: #0066cc; font-weight: bold; font-size: 11pt; "
-                    "padding: 8px; background-color: #f0f8ff; border-radius: 4px;"
-                )
+                _set_style_state(self.preview_label, "")
         except Exception:
             self.preview_label.setText("Preview unavailable")
 
@@ -304,14 +378,26 @@ class GSLGui(QWidget):
         super().__init__()
         self.setWindowTitle("GSL & Ceramide Transition Generator v1.1")
         self.setMinimumSize(1200, 900)
+        QApplication.instance().setStyleSheet(_STYLE_SHEET)
 
         # Initialize charge/adduct tracking dictionaries
         self.charge_checkboxes = {}
         self.adduct_checkboxes_by_charge = {}
         self.adduct_group_boxes = {}
+        self.adduct_button_groups = {}
+
+        # Base transition DataFrames from recent runs, oldest first
+        self._gen_cache = OrderedDict()
 
-        # Initialize auto-save blocking flag
-        self.block_auto_save = False
+        self._auto_save_connected = False
+
+        # Auto-saves are coalesced: each change restarts the timer and the
+        # config is written once the widgets have been quiet for 200 ms
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(200)
+        self._save_timer.timeout.connect(self._write_ui_state)
+        QApplication.instance().aboutToQuit.connect(self._flush_ui_state)
 
         # Set window icon
         self.set_window_icon()
@@ -349,7 +435,6 @@ class GSLGui(QWidget):
         for charge in [1, 2, 3, 4, 5]:
             cb = QCheckBox(f"Charge ±{charge}")
             cb.setChecked(charge == 1)
-            cb.stateChanged.connect(self.update_adduct_visibility)
             self.charge_checkboxes[charge] = cb
             charge_layout.addWidget(cb)
         charge_layout.addStretch()
@@ -366,22 +451,8 @@ class GSLGui(QWidget):
         adduct_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         selection_layout.addWidget(adduct_label)
 
-        # Define adducts by charge state
-        adducts_by_charge = {
-            1: {'positive': ['[M+H]+', '[M+Na]+', '[M+NH4]+'],
-                'negative': ['[M-H]-', '[M+CH3COO]-', '[M+HCOO]-']},
-            2: {'positive': ['[M+2H]2+', '[M+H+Na]2+', '[M+2Na]2+'],
-                'negative': ['[M-2H]2-']},
-            3: {'positive': ['[M+3H]3+', '[M+2H+Na]3+', '[M+H+2Na]3+', '[M+3Na]3+'],
-                'negative': ['[M-3H]3-']},
-            4: {'positive': ['[M+4H]4+'],
-                'negative': ['[M-4H]4-']},
-            5: {'positive': ['[M+5H]5+'],
-                'negative': ['[M-5H]5-']}
-        }
-
         # Create adduct groups for each charge state
-        for charge in [1, 2, 3, 4, 5]:
+        for charge, positive_adducts, negative_adducts in _ADDUCTS_BY_CHARGE:
             group_box = QGroupBox(f"Charge ±{charge}")
             group_layout = QVBoxLayout()
             self.adduct_checkboxes_by_charge[charge] = {}
@@ -391,7 +462,7 @@ class GSLGui(QWidget):
             pos_label.setStyleSheet("font-style: italic; color: #0066cc;")
             group_layout.addWidget(pos_label)
             pos_layout = QHBoxLayout()
-            for adduct in adducts_by_charge[charge]['positive']:
+            for adduct in positive_adducts:
                 cb = QCheckBox(adduct)
                 cb.setChecked(True)
                 self.adduct_checkboxes_by_charge[charge][adduct] = cb
@@ -404,7 +475,7 @@ class GSLGui(QWidget):
             neg_label.setStyleSheet("font-style: italic; color: #cc6600;")
             group_layout.addWidget(neg_label)
             neg_layout = QHBoxLayout()
-            for adduct in adducts_by_charge[charge]['negative']:
+            for adduct in negative_adducts:
                 cb = QCheckBox(adduct)
                 cb.setChecked(True)
                 self.adduct_checkboxes_by_charge[charge][adduct] = cb
@@ -414,13 +485,17 @@ class GSLGui(QWidget):
 
             group_box.setLayout(group_layout)
             self.adduct_group_boxes[charge] = group_box
+
+            # Non-exclusive button group: one toggled signal for the charge's adducts
+            button_group = QButtonGroup(group_box)
+            button_group.setExclusive(False)
+            for cb in self.adduct_checkboxes_by_charge[charge].values():
+                button_group.addButton(cb)
+            self.adduct_button_groups[charge] = button_group
             selection_layout.addWidget(group_box)
 
         selection_group.setLayout(selection_layout)
 
-        # Initialize visibility based on default charge state selection
-        self.update_adduct_visibility()
-
         # === ISOTOPE LABELING OPTIONS ===
         label_group = QGroupBox("Isotope Labeling Options")
         label_layout = QVBoxLayout()
@@ -483,11 +558,13 @@ class GSLGui(QWidget):
 
         # Status label
         self.status_label = QLabel("")
+        self.status_label.setObjectName("status_label")
         layout.addWidget(self.status_label)
 
         # Results table
         layout.addWidget(QLabel("Results:"))
-        self.table = QTableWidget()
+        self.table = QTableView()
+        self.table_model = None
         layout.addWidget(self.table)
 
         scroll.setWidget(main_widget)
@@ -506,23 +583,17 @@ class GSLGui(QWidget):
 
         self.df = None
         self.update_info()
+        # Restores the saved selections and sets the adduct group visibility;
+        # checkbox signals are connected only afterwards
         self.load_ui_state()
+        for cb in self.charge_checkboxes.values():
+            cb.stateChanged.connect(self.update_adduct_visibility)
         self.connect_auto_save_signals()
 
 
     def update_info(self):
         """Update info display when lipid class changes"""
-        lipid_class = self.lipid_combo.currentText()
-        structure = gslgen.LipidDatabase.get_structure_description(lipid_class)
-        mw_range = gslgen.LipidDatabase.molecular_weight_range(lipid_class)
-        sialic_count = gslgen.LipidDatabase.get_sialic_acid_count(lipid_class)
-
-        info = f"Structure: {structure}\n"
-        info += f"MW Range: {mw_range} Da\n"
-        if sialic_count > 0:
-            info += f"Sialic Acids: {sialic_count}"
-
-        self.info_text.setText(info)
+        self.info_text.setText(_lipid_info_text(self.lipid_combo.currentText()))
 
     def set_recommended_charges(self):
         """Set recommended charge states for current lipid class"""
@@ -534,6 +605,8 @@ class GSLGui(QWidget):
 
     def show_config_dialog(self):
         """Show configuration dialog"""
+        # The dialog saves on top of the config it loads, so write pending UI state first
+        self._flush_ui_state()
         dialog = ConfigDialog(self)
         dialog.exec()
 
@@ -557,31 +630,18 @@ class GSLGui(QWidget):
             return
 
         try:
-            logger.info(f"Starting generation: {lipid_class}, charges={charge_states}")
-            # Generate transitions with configuration
-            transitions = gslgen.generate_transitions(
-                lipid_class,
-                charge_states,
-                selected_adducts
-            )
-
-            logger.info(f"Generation complete: {len(transitions)} transitions")
-
-            df = pd.DataFrame(transitions)
+            df = self._generate_base_transitions(lipid_class, charge_states, selected_adducts)
 
-            # Add isotope labels if requested
+            # Add isotope labels and/or blank m/z values if requested
+            labels = None
             if self.add_labels_checkbox.isChecked():
-                df = gslgen.add_isotope_labels(
-                    df,
+                labels = dict(
                     isotope=self.isotope_input.text(),
                     doxcer_isotope=self.doxcer_isotope_input.text(),
                     cer_isotope=self.cer_isotope_input.text(),
                     lcb=self.lcb_input.text()
                 )
-
-            # Apply blanking
-            if self.blank_mz_checkbox.isChecked():
-                df = gslgen.blank_mz_values(df)
+            df = gslgen.post_process(df, labels=labels, blank=self.blank_mz_checkbox.isChecked())
 
             self.df = df
             self.populate_table(df)
@@ -596,22 +656,51 @@ class GSLGui(QWidget):
             logger.error(f"Generation failed: {str(e)}", exc_info=True)
             self._show_error(f"Error: {str(e)}")
 
-    def populate_table(self, df):
-        """Populate table from dataframe"""
-        self.table.setRowCount(len(df))
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(df.columns)
+    def _generate_base_transitions(self, lipid_class, charge_states, selected_adducts):
+        """
+        Unlabelled transitions as a DataFrame, reusing the result of an earlier
+        run with the same inputs. The chain configuration is part of the key.
+        """
+        key = (lipid_class, charge_states, selected_adducts,
+               tuple(gslgen.ConfigManager.get_lcb_list(lipid_class)),
+               tuple(gslgen.ConfigManager.get_fatty_acid_list()))
+
+        cached = self._gen_cache.get(key)
+        if cached is not None:
+            self._gen_cache.move_to_end(key)
+            logger.info(f"Reusing {len(cached)} transitions for {lipid_class}")
+            return cached.copy()
+
+        logger.info(f"Starting generation: {lipid_class}, charges={charge_states}")
+        # Generate transitions with configuration
+        transitions = gslgen.generate_transition_rows(
+            lipid_class,
+            charge_states,
+            selected_adducts
+        )
 
-        for i, row in df.iterrows():
-            for j, col in enumerate(df.columns):
-                self.table.setItem(i, j, QTableWidgetItem(str(row[col])))
+        logger.info(f"Generation complete: {len(transitions)} transitions")
 
+        # Deferred until the first generation so the window opens without pandas
+        import pandas as pd
+        df = pd.DataFrame.from_records(transitions, columns=gslgen.TRANSITION_COLUMNS)
+        self._gen_cache[key] = df
+        if len(self._gen_cache) > 8:
+            self._gen_cache.popitem(last=False)
+        return df.copy()
+
+    def populate_table(self, df):
+        """Populate table from dataframe"""
+        # The model keeps the DataFrame as backing store; only the cells the
+        # view actually draws are formatted
+        self.table_model = PandasModel(df)
+        self.table.setModel(self.table_model)
         self.table.resizeColumnsToContents()
 
     def clear_results(self):
         """Clear results table"""
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.table.setModel(None)
+        self.table_model = None
         self.df = None
         self.status_label.setText("")
 
@@ -633,7 +722,12 @@ class GSLGui(QWidget):
 
         if path:
             try:
-                self.df.to_csv(path, index=False)
+                if self.df.isna().to_numpy().any():
+                    # csv.writer would write NaN as "nan"; to_csv leaves it empty
+                    self.df.to_csv(path, index=False)
+                else:
+                    gslgen.write_transitions_csv(self.df.itertuples(index=False, name=None),
+                                                 path, columns=self.df.columns)
                 self._show_success(f"Saved {len(self.df)} rows to {path}")
             except Exception as e:
                 self._show_error(f"Save error: {str(e)}")
@@ -707,40 +801,22 @@ please visit the project repository for citation information:</p>
     def _show_success(self, message):
         """Display a success status message"""
         self.status_label.setText(message)
-        self.status_label.setStyleSheet(
-            "color: green; "
-            "font-weight: bold; "
-            "background-color: #e8f5e9; "
-            "padding: 5px; "
-            "border-radius: 3px;"
-        )
+        _set_style_state(self.status_label, "success")
 
     def _show_error(self, message):
         """Display an error status message"""
         self.status_label.setText(f"❌ {message}")
-        self.status_label.setStyleSheet(
-            "color: red; "
-            "font-weight: bold; "
-            "background-color: #ffebee; "
-            "padding: 5px; "
-            "border-radius: 3px;"
-        )
+        _set_style_state(self.status_label, "error")
 
     def _show_warning(self, message):
         """Display a warning status message"""
         self.status_label.setText(f"⚠️ {message}")
-        self.status_label.setStyleSheet(
-            "color: #ff9800; "
-            "font-weight: bold; "
-            "background-color: #fff3e0; "
-            "padding: 5px; "
-            "border-radius: 3px;"
-        )
+        _set_style_state(self.status_label, "warning")
 
     def _clear_status(self):
         """Clear the status message"""
         self.status_label.setText("")
-        self.status_label.setStyleSheet("")
+        _set_style_state(self.status_label, "")
 
     def update_adduct_visibility(self):
         """Show/hide adduct groups based on selected charge states."""
@@ -748,70 +824,117 @@ please visit the project repository for citation information:</p>
             group_box.setVisible(self.charge_checkboxes[charge].isChecked())
 
     def get_selected_charge_states(self):
-        """Return list of selected charge states."""
-        return [charge for charge, cb in self.charge_checkboxes.items() if cb.isChecked()]
+        """Return tuple of selected charge states."""
+        return tuple(charge for charge, cb in self.charge_checkboxes.items() if cb.isChecked())
 
     def get_selected_adducts(self):
-        """Return list of selected adducts from visible charge state groups."""
-        selected = []
-        for charge in self.get_selected_charge_states():
-            for adduct, cb in self.adduct_checkboxes_by_charge[charge].items():
-                if cb.isChecked():
-                    selected.append(adduct)
-        return selected or None
+        """Return tuple of selected adducts from visible charge state groups."""
+        return tuple(
+            adduct
+            for charge, charge_cb in self.charge_checkboxes.items() if charge_cb.isChecked()
+            for adduct, cb in self.adduct_checkboxes_by_charge[charge].items() if cb.isChecked()
+        ) or None
 
     def save_ui_state(self):
+        """Schedule saving the current UI selections to config"""
+        self._save_timer.start()
+
+    def _flush_ui_state(self):
+        """Write a pending auto-save right away (e.g. on quit)"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._write_ui_state()
+
+    def _write_ui_state(self):
         """Save current UI selections to config"""
-        if self.block_auto_save:  # ← ADD THIS CHECK
-            return
+        # Re-read so chain settings saved by the config dialog are kept;
+        # load_config only re-parses the file when it has changed
         config = gslgen.ConfigManager.load_config()
-        config['charge_states'] = self.get_selected_charge_states()
-        config['selected_adducts'] = self.get_selected_adducts()
-        config['isotope_labeling'] = {
-            'enabled': self.add_labels_checkbox.isChecked(),
-            'gsl_isotope': self.isotope_input.text(),
-            'cer_isotope': self.cer_isotope_input.text(),
-            'doxcer_isotope': self.doxcer_isotope_input.text(),
-            'label_keywords': self.lcb_input.text(),
-            'blank_mz': self.blank_mz_checkbox.isChecked()
+        selected_adducts = self.get_selected_adducts()
+        # Lists, as they come back from the JSON file, so the comparison below holds
+        ui_state = {
+            'charge_states': list(self.get_selected_charge_states()),
+            'selected_adducts': list(selected_adducts) if selected_adducts else selected_adducts,
+            'isotope_labeling': {
+                'enabled': self.add_labels_checkbox.isChecked(),
+                'gsl_isotope': self.isotope_input.text(),
+                'cer_isotope': self.cer_isotope_input.text(),
+                'doxcer_isotope': self.doxcer_isotope_input.text(),
+                'label_keywords': self.lcb_input.text(),
+                'blank_mz': self.blank_mz_checkbox.isChecked()
+            }
         }
+        # Nothing to write if the file already holds this state (e.g. a toggle
+        # that was undone before the save timer fired)
+        if all(config.get(key) == value for key, value in ui_state.items()):
+            return
+        config.update(ui_state)
         gslgen.ConfigManager.save_config(config)
 
     def load_ui_state(self):
         """Load UI selections from config"""
         config = gslgen.ConfigManager.load_config()
-        saved_charges = config.get('charge_states', [1])
-        for charge, cb in self.charge_checkboxes.items():
-            cb.setChecked(charge in saved_charges)
-
-        saved_adducts = config.get('selected_adducts', None)
-        if saved_adducts:
-            for charge in self.adduct_checkboxes_by_charge:
-                for adduct, cb in self.adduct_checkboxes_by_charge[charge].items():
-                    cb.setChecked(adduct in saved_adducts)
-
-        isotope_config = config.get('isotope_labeling', {})
-        self.add_labels_checkbox.setChecked(isotope_config.get('enabled', False))
-        self.isotope_input.setText(isotope_config.get('gsl_isotope', 'M2DN15'))
-        self.cer_isotope_input.setText(isotope_config.get('cer_isotope', 'M2DN15'))
-        self.doxcer_isotope_input.setText(isotope_config.get('doxcer_isotope', 'M3D'))
-        self.lcb_input.setText(isotope_config.get('label_keywords', 'LCB,precursor,HG(-'))
-        self.blank_mz_checkbox.setChecked(isotope_config.get('blank_mz', False))
+        # Set every widget with its signals blocked, so restoring the state does
+        # not fan out into visibility updates and auto-saves per widget
+        widgets = self._state_widgets()
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            saved_charges = config.get('charge_states', [1])
+            for charge, cb in self.charge_checkboxes.items():
+                cb.setChecked(charge in saved_charges)
+
+            saved_adducts = config.get('selected_adducts', None)
+            if saved_adducts:
+                for charge in self.adduct_checkboxes_by_charge:
+                    for adduct, cb in self.adduct_checkboxes_by_charge[charge].items():
+                        cb.setChecked(adduct in saved_adducts)
+
+            isotope_config = config.get('isotope_labeling', {})
+            self.add_labels_checkbox.setChecked(isotope_config.get('enabled', False))
+            self.isotope_input.setText(isotope_config.get('gsl_isotope', 'M2DN15'))
+            self.cer_isotope_input.setText(isotope_config.get('cer_isotope', 'M2DN15'))
+            self.doxcer_isotope_input.setText(isotope_config.get('doxcer_isotope', 'M3D'))
+            self.lcb_input.setText(isotope_config.get('label_keywords', 'LCB,precursor,HG(-'))
+            self.blank_mz_checkbox.setChecked(isotope_config.get('blank_mz', False))
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
         self.update_adduct_visibility()
 
+    def _state_widgets(self):
+        """Widgets whose state is saved to and restored from the config"""
+        widgets = list(self.charge_checkboxes.values())
+        for adduct_checkboxes in self.adduct_checkboxes_by_charge.values():
+            widgets.extend(adduct_checkboxes.values())
+        # The groups are notified by their buttons directly, not via signals
+        widgets.extend(self.adduct_button_groups.values())
+        widgets += [self.add_labels_checkbox, self.isotope_input, self.cer_isotope_input,
+                    self.doxcer_isotope_input, self.lcb_input, self.blank_mz_checkbox]
+        return widgets
+
     def connect_auto_save_signals(self):
-        """Connect signals for auto-saving UI state"""
+        """Connect signals for auto-saving UI state (only once per window)"""
+        if self._auto_save_connected:
+            return
+        self._auto_save_connected = True
+
+        # One bound slot for all connections; every sender lives in the GUI
+        # thread, so the connections are direct
+        slot = self.save_ui_state
+        direct = Qt.DirectConnection
         for cb in self.charge_checkboxes.values():
-            cb.stateChanged.connect(self.save_ui_state)
-        for charge in self.adduct_checkboxes_by_charge:
-            for cb in self.adduct_checkboxes_by_charge[charge].values():
-                cb.stateChanged.connect(self.save_ui_state)
-        self.add_labels_checkbox.stateChanged.connect(self.save_ui_state)
-        self.isotope_input.textChanged.connect(self.save_ui_state)
-        self.cer_isotope_input.textChanged.connect(self.save_ui_state)
-        self.doxcer_isotope_input.textChanged.connect(self.save_ui_state)
-        self.lcb_input.textChanged.connect(self.save_ui_state)
-        self.blank_mz_checkbox.stateChanged.connect(self.save_ui_state)
+            cb.stateChanged.connect(slot, direct)
+        for button_group in self.adduct_button_groups.values():
+            button_group.buttonToggled.connect(slot, direct)
+        # Text fields save once editing is finished (Enter or focus out), not per keystroke
+        for signal in (self.add_labels_checkbox.stateChanged,
+                       self.isotope_input.editingFinished,
+                       self.cer_isotope_input.editingFinished,
+                       self.doxcer_isotope_input.editingFinished,
+                       self.lcb_input.editingFinished,
+                       self.blank_mz_checkbox.stateChanged):
+            signal.connect(slot, direct)
 
     def reset_to_defaults(self):
         """Reset all settings to default values"""
@@ -824,19 +947,16 @@ please visit the project repository for citation information:</p>
         )
 
         if reply == QMessageBox.Yes:
-            # Block auto-save during reset
-            self.block_auto_save = True
+            # Drop any pending auto-save so it cannot overwrite the defaults
+            self._save_timer.stop()
 
-            # Get default config and save it
-            default_config = gslgen.ConfigManager.get_default_config()
-            gslgen.ConfigManager.save_config(default_config)
+            # Save the default config, unless the file already holds it
+            gslgen.ConfigManager.reset_config()
 
-            # Reload UI from defaults
+            # Reload UI from defaults; load_ui_state blocks the widget
+            # signals, so this does not trigger auto-saves
             self.load_ui_state()
 
-            # Re-enable auto-save
-            self.block_auto_save = False
-
             QMessageBox.information(
                 self,
                 "Reset Complete",
@@ -1,16 +1,65 @@
-import pandas as pd
 import re
-from constants import ADDUCT_INSERT_RE
-from chemistry import parse_isotope_label, calculate_isotope_mass_shift, filter_isotope_token
+from typing import TYPE_CHECKING, Optional
+import numpy as np
+from chemistry import parse_isotope_label, calculate_isotope_mass_shifts, filter_isotope_token
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# '[' plus an optional multimer count before 'M', e.g. '[M' or '[2M'
+ADDUCT_INSERT_RE = re.compile(r'^\[(?P<prefix>\d*)M', re.ASCII)
+
+def _isotope_shifts(tokens) -> np.ndarray:
+    """Mass shift for each isotope token (0 for empty tokens), parsed once per distinct token."""
+    tokens = list(tokens)
+    unique_tokens = list(dict.fromkeys(tokens))
+    unique_shifts = calculate_isotope_mass_shifts(parse_isotope_label(token) for token in unique_tokens)
+    shift_by_token = dict(zip(unique_tokens, unique_shifts.tolist()))
+    return np.array([shift_by_token[token] for token in tokens], dtype=np.float64)
+
+def _has_token(tokens) -> np.ndarray:
+    """True where the filtered isotope token is present and non-empty (None/NaN/NA mean unlabelled)."""
+    import pandas as pd
+    return np.array([not pd.isna(tok) and bool(tok) for tok in tokens], dtype=bool)
+
+def _column_or_blank(df: "pd.DataFrame", col: str):
+    """Values of df[col], or '' for every row if the column is missing."""
+    return df[col].to_numpy() if col in df.columns else [''] * len(df)
+
+def _shift_mz(mz: "pd.Series", shifts: np.ndarray, labeled: np.ndarray) -> "pd.Series":
+    """mz + shift rounded to 4 decimals where labeled and mz is numeric; other values unchanged."""
+    import pandas as pd
+    numeric = pd.to_numeric(mz, errors='coerce')
+    labeled = labeled & numeric.notna().to_numpy()
+    return mz.mask(labeled, np.round(numeric.to_numpy(dtype=float) + shifts, 4))
+
+def _insert_isotope_tokens(adducts: "pd.Series", tokens: "pd.Series", selected: np.ndarray) -> "pd.Series":
+    """
+    Insert each selected row's isotope token into its adduct notation, uppercased.
 
-ADDUCT_INSERT_RE = re.compile(r'^\[(?P<prefix>\d*)M')
+    Examples:
+        '[M+H]1+' + 'm2dn15' -> '[M2DN15+H]1+'
+        '[2M-H]1-' + 'M3D' -> '[2M3D-H]1-'
 
-def blank_mz_values(df: pd.DataFrame) -> pd.DataFrame:
+    One vectorized str.replace runs per distinct token; other rows are unchanged.
+    """
+    result = adducts.copy()
+    selected = selected & np.array([isinstance(adduct, str) for adduct in adducts], dtype=bool)
+    tokens = tokens.to_numpy()
+    for token in dict.fromkeys(tokens[selected]):
+        rows = selected & (tokens == token)
+        replacement = '[\\g<prefix>' + token.strip().upper().replace('\\', '\\\\')
+        result[rows] = adducts[rows].str.replace(ADDUCT_INSERT_RE, replacement, n=1, regex=True)
+    return result
+
+def blank_mz_values(df: "pd.DataFrame") -> "pd.DataFrame":
     """
     Blank all m/z values in the dataframe.
 
+    Returns a new frame; only the blanked columns are new, the others are
+    shared with the input (shallow copy) rather than duplicated.
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     # Target columns that contain m/z values
     target_cols = ['Precursor m/z', 'Product m/z']
 
@@ -25,56 +74,39 @@ def blank_mz_values(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def add_isotope_labels(df: pd.DataFrame, isotope: str = 'M2DN15',
+def add_isotope_labels(df: "pd.DataFrame", isotope: str = 'M2DN15',
                        doxcer_isotope: str = 'M3D', cer_isotope: str = 'M2DN15',
-                       lcb: str = "LCB,precursor,HG(-") -> pd.DataFrame:
-    """Add isotope labels WITH calculated m/z values."""
-
-    df.rename(columns=lambda c: c.lstrip('\ufeff').strip(), inplace=True)
-
-    light = df.copy()
-    light['Isotope Label Type'] = 'light'
-
-    heavy = df.copy()
-    heavy['Isotope Label Type'] = 'heavy'
-
-    # Get isotope token for each lipid class
-    def get_isotope_token(list_name):
-        if list_name == 'doxCer':
-            return doxcer_isotope
-        elif list_name == 'Cer':
-            return cer_isotope
-        else:
-            return isotope
-
-    heavy.loc[:, 'Isotope Token'] = heavy['Molecule List Name'].apply(get_isotope_token)
-
-    # Calculate mass shift for each row
-    def get_mass_shift(iso_token):
-        isotope_composition = parse_isotope_label(iso_token)
-        return calculate_isotope_mass_shift(isotope_composition)
+                       lcb: str = "LCB,precursor,HG(-", skip_mz: bool = False) -> "pd.DataFrame":
+    """
+    Add isotope labels WITH calculated m/z values.
 
-    heavy.loc[:, 'Mass Shift'] = heavy['Isotope Token'].apply(get_mass_shift)
+    With skip_mz=True only the adducts are labelled and the heavy m/z values
+    are copied unshifted, for callers that blank m/z afterwards anyway.
+    """
+    import pandas as pd
 
-    def to_heavy_adduct(adduct, iso_token):
-        """
-        Insert isotope label into adduct notation with uppercase normalization.
+    # Strip BOM/whitespace from column names; no rename when they are already clean
+    renamed = {c: c.lstrip('\ufeff').strip() for c in df.columns}
+    renamed = {old: new for old, new in renamed.items() if old != new}
+    if renamed:
+        df.rename(columns=renamed, inplace=True)
 
-        Examples:
-            'M+H' + 'm2dn15' -> 'M[M2DN15+H' (normalized to uppercase)
-            'M+H' + 'M2DN15' -> 'M[M2DN15+H' (already uppercase)
-        """
-        if not isinstance(adduct, str) or not adduct.strip():
-            return adduct
+    # Light rows are the input unchanged: a shallow copy is enough, since
+    # pd.concat below copies the data once anyway
+    light = df.copy(deep=False)
+    light['Isotope Label Type'] = 'light'
 
-        # Normalize isotope token to uppercase for consistent display
-        iso_token_normalized = iso_token.strip().upper()
+    # The heavy rows are built as new column values and applied with one
+    # df.assign at the end; the token columns stay local instead of being
+    # added to the frame and dropped again
+    heavy_columns = {'Isotope Label Type': 'heavy'}
 
-        return ADDUCT_INSERT_RE.sub(
-            lambda m: f'[{m.group("prefix")}{iso_token_normalized}',
-            adduct,
-            count=1
-        )
+    # Isotope token for each lipid class: doxCer and Cer have their own, all others use isotope
+    class_tokens = {'doxCer': doxcer_isotope, 'Cer': cer_isotope}
+    list_names = df['Molecule List Name']
+    # Mapped through a function so that a deliberately empty (None) class token
+    # stays None; a dict mapping would turn it into NaN
+    isotope_tokens = list_names.map(lambda name: class_tokens.get(name, isotope))
 
     # ====================================================================
     # 1. TOKEN FILTERING ENGINE
@@ -85,47 +117,56 @@ def add_isotope_labels(df: pd.DataFrame, isotope: str = 'M2DN15',
     # ====================================================================
     # 2. APPLY FILTER TO PRECURSORS
     # ====================================================================
-    heavy['Filtered_Precursor_Token'] = heavy.apply(
-        lambda r: filter_isotope_token(r['Isotope Token'], r.get('Molecule Formula', '')), axis=1
-    )
-
-    heavy.loc[:, 'Precursor Adduct'] = [
-        to_heavy_adduct(a, tok) if tok else a
-        for a, tok in zip(heavy['Precursor Adduct'], heavy['Filtered_Precursor_Token'])
-    ]
-
-    if 'Precursor m/z' in heavy.columns:
-        heavy.loc[:, 'Precursor m/z'] = heavy.apply(
-            lambda row: round(row['Precursor m/z'] + (calculate_isotope_mass_shift(parse_isotope_label(row['Filtered_Precursor_Token'])) / abs(row['Precursor Charge'])), 4)
-            if pd.notna(row['Precursor m/z']) and row['Precursor m/z'] != '' and row['Filtered_Precursor_Token'] else row['Precursor m/z'],
-            axis=1
-        )
+    precursor_tokens = pd.Series([
+        filter_isotope_token(tok, formula)
+        for tok, formula in zip(isotope_tokens, _column_or_blank(df, 'Molecule Formula'))
+    ], index=df.index, dtype=object)
+
+    has_token = _has_token(precursor_tokens)
+    heavy_columns['Precursor Adduct'] = _insert_isotope_tokens(df['Precursor Adduct'], precursor_tokens, has_token)
+
+    if 'Precursor m/z' in df.columns and not skip_mz:
+        shifts = _isotope_shifts(precursor_tokens) / df['Precursor Charge'].abs().to_numpy()
+        heavy_columns['Precursor m/z'] = _shift_mz(df['Precursor m/z'], shifts, has_token)
 
     # ====================================================================
     # 3. APPLY FILTER TO PRODUCTS
     # ====================================================================
+    # Products whose name contains any label keyword (case-insensitive)
     keywords = [k.strip() for k in lcb.split(',') if k.strip()]
+    if keywords:
+        keyword_pattern = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+        label_product = df['Product Name'].astype(str).str.lower().str.contains(keyword_pattern).to_numpy(dtype=bool)
+    else:
+        label_product = np.zeros(len(df), dtype=bool)
 
-    def should_label_product(product_name, product_formula):
-        product_lower = str(product_name).lower()
-        return any(keyword.lower() in product_lower for keyword in keywords)
-
-    heavy['Filtered_Product_Token'] = heavy.apply(
-        lambda r: filter_isotope_token(r['Isotope Token'], r.get('Product Formula', '')), axis=1
-    )
+    product_tokens = pd.Series([
+        filter_isotope_token(tok, formula)
+        for tok, formula in zip(isotope_tokens, _column_or_blank(df, 'Product Formula'))
+    ], index=df.index, dtype=object)
 
-    heavy.loc[:, 'Product Adduct'] = [
-        to_heavy_adduct(a, tok) if should_label_product(n, f) and tok else a
-        for a, n, f, tok in zip(heavy['Product Adduct'], heavy['Product Name'], heavy['Product Formula'], heavy['Filtered_Product_Token'])
-    ]
+    label_product = label_product & _has_token(product_tokens)
+    heavy_columns['Product Adduct'] = _insert_isotope_tokens(df['Product Adduct'], product_tokens, label_product)
 
-    if 'Product m/z' in heavy.columns:
-        heavy.loc[:, 'Product m/z'] = heavy.apply(
-            lambda row: round(row['Product m/z'] + (calculate_isotope_mass_shift(parse_isotope_label(row['Filtered_Product_Token'])) / abs(row['Product Charge'])), 4)
-            if pd.notna(row['Product m/z']) and row['Product m/z'] != '' and row['Filtered_Product_Token'] and should_label_product(row['Product Name'], row['Product Formula']) else row['Product m/z'],
-            axis=1
-        )
+    if 'Product m/z' in df.columns and not skip_mz:
+        shifts = _isotope_shifts(product_tokens) / df['Product Charge'].abs().to_numpy()
+        heavy_columns['Product m/z'] = _shift_mz(df['Product m/z'], shifts, label_product)
 
-    heavy = heavy.drop(['Isotope Token', 'Mass Shift', 'Filtered_Precursor_Token', 'Filtered_Product_Token'], axis=1, errors='ignore')
+    heavy = df.assign(**heavy_columns)
 
     return pd.concat([light, heavy], ignore_index=True)
+
+def post_process(df: "pd.DataFrame", *, labels: Optional[dict] = None, blank: bool = False) -> "pd.DataFrame":
+    """
+    Isotope labelling and/or m/z blanking in one call.
+
+    labels holds the add_isotope_labels keyword arguments (None: no labels).
+    When both are requested the m/z columns are blanked before labelling, so
+    the light/heavy concat copies the blank columns instead of shifted values
+    that would be thrown away.
+    """
+    if blank:
+        df = blank_mz_values(df)
+    if labels is not None:
+        df = add_isotope_labels(df, **labels, skip_mz=blank)
+    return df